@@ -2,19 +2,13 @@ import time
 import math
 import threading
 import cv2
+import numpy as np
 import mediapipe as mp
-from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
-from pathlib import Path
 
-# ============================================================
-# Resolve model path ABSOLUTELY (relative to this file)
-# ============================================================
-THIS_DIR = Path(__file__).resolve().parent
-MODEL_PATH = (THIS_DIR / "pose_landmarker.task").resolve()
-
-if not MODEL_PATH.exists():
-    raise FileNotFoundError(f"Pose model not found at: {MODEL_PATH}")
+from profiling import get_stage_timer
+# Body/pose_landmarker.task is read once by the models registry
+from models import acquire_landmarker, create_landmarker, release_landmarker
 
 # ============================================================
 # Pose skeleton connections (BlazePose-style)
@@ -41,29 +35,53 @@ POSE_CONNECTIONS = [
     (9, 10),
 ]
 
+# precomputed (K, 2) index array so bones can be gathered in one shot
+POSE_CONNECTION_IDX = np.asarray(POSE_CONNECTIONS, dtype=np.intp)
+
 # ============================================================
 # Drawing helpers
 # ============================================================
+def landmarks_to_array(landmarks) -> np.ndarray:
+    """
+    MediaPipe landmark list -> (N, 4) float32 array of x, y, z, visibility.
+    Missing visibility is stored as 1.0 (treated as visible).
+    """
+    return np.array(
+        [
+            (lm.x, lm.y, getattr(lm, "z", 0.0) or 0.0,
+             1.0 if getattr(lm, "visibility", None) is None else lm.visibility)
+            for lm in landmarks
+        ],
+        dtype=np.float32,
+    ).reshape(-1, 4)
+
 def draw_pose_skeleton(frame_bgr, landmarks, min_visibility=0.5):
+    """
+    Vectorized overlay: one polylines call for all visible bones and one for
+    all visible joints.
+    `landmarks` may be a MediaPipe landmark list or a landmarks_to_array() array.
+    """
     h, w = frame_bgr.shape[:2]
-    points = []
+    lms = landmarks if isinstance(landmarks, np.ndarray) else landmarks_to_array(landmarks)
+    if len(lms) == 0:
+        return
 
-    for lm in landmarks:
-        if hasattr(lm, "visibility") and lm.visibility is not None and lm.visibility < min_visibility:
-            points.append(None)
-            continue
-        x, y = int(lm.x * w), int(lm.y * h)
-        points.append((x, y))
+    points = (lms[:, :2] * (w, h)).astype(np.int32)
+    visible = lms[:, 3] >= min_visibility
 
     # Draw bones
-    for a, b in POSE_CONNECTIONS:
-        if a < len(points) and b < len(points) and points[a] and points[b]:
-            cv2.line(frame_bgr, points[a], points[b], (0, 255, 0), 2)
-
-    # Draw joints
-    for p in points:
-        if p:
-            cv2.circle(frame_bgr, p, 3, (0, 255, 255), -1)
+    conn = POSE_CONNECTION_IDX
+    if len(lms) <= conn.max():
+        conn = conn[(conn < len(lms)).all(axis=1)]
+    conn = conn[visible[conn].all(axis=1)]
+    if len(conn):
+        cv2.polylines(frame_bgr, points[conn], False, (0, 255, 0), 2)
+
+    # Draw joints: zero-length segments with round caps; thickness 6 gives the
+    # same pixels as a filled radius-3 circle, in one call instead of 33
+    joints = points[visible]
+    if len(joints):
+        cv2.polylines(frame_bgr, np.repeat(joints[:, None, :], 2, axis=1), False, (0, 255, 255), 6)
 
 # ============================================================
 # Fall detector
@@ -83,11 +101,24 @@ class FallDetector:
         self.low_hip_y_thresh = 0.72
         self.confirm_seconds = 0.45
 
+    def reset(self):
+        """Forget motion history (e.g. after the stream was paused)."""
+        self.prev_t = None
+        self.prev_hip_y = None
+        self.state = "OK"
+        self.trigger_time = None
+
     def _vis_ok(self, lm, min_vis=0.4):
         return (not hasattr(lm, "visibility")) or (lm.visibility is None) or (lm.visibility >= min_vis)
 
-    def update(self, landmarks):
-        now = time.time()
+    def update(self, landmarks, now: float | None = None):
+        """
+        `landmarks`: MediaPipe landmark list or (N, 4) array of
+        x, y, z, visibility in full-frame normalized coords.
+        `now`: frame time in seconds (any monotonic base); defaults to time.time().
+        """
+        if now is None:
+            now = time.time()
         if self.prev_t is None:
             self.prev_t = now
 
@@ -105,12 +136,19 @@ class FallDetector:
             "reason": None,
         }
 
-        if not (self._vis_ok(lh) and self._vis_ok(rh)):
+        if isinstance(landmarks, np.ndarray):
+            hips_visible = lh[3] >= 0.4 and rh[3] >= 0.4
+            lh_y, rh_y = float(lh[1]), float(rh[1])
+        else:
+            hips_visible = self._vis_ok(lh) and self._vis_ok(rh)
+            lh_y, rh_y = lh.y, rh.y
+
+        if not hips_visible:
             self.prev_t = now
             info["reason"] = "low_visibility"
             return False, info
 
-        hip_y = (lh.y + rh.y) / 2.0
+        hip_y = (lh_y + rh_y) / 2.0
 
         hip_vy = 0.0
         if self.prev_hip_y is not None:
@@ -159,13 +197,334 @@ class FallDetector:
 
         return fell, info
 
+# ============================================================
+# Motion gate (skip inference on static scenes)
+# ============================================================
+class MotionGate:
+    """
+    Cheap scene-change check in front of the pose model.
+
+    Each frame is downscaled to `width` px grayscale and compared against a
+    running-average background. While something moves (or for `hold_seconds`
+    after) every frame is inferred; on a static scene inference drops to one
+    keep-alive frame every `idle_interval` seconds.
+
+    Keep idle_interval below FallDetector.shock_window_sec so the first
+    update after motion starts still has a usable dt (run_pose_skeleton
+    clamps it to that window).
+    """
+
+    def __init__(
+        self,
+        width: int = 160,
+        pixel_thresh: int = 18,
+        motion_ratio: float = 0.004,
+        idle_interval: float = 0.25,
+        hold_seconds: float = 1.5,
+        bg_alpha: float = 0.05,
+    ):
+        self.width = width
+        self.pixel_thresh = pixel_thresh
+        self.motion_ratio = motion_ratio
+        self.idle_interval = idle_interval
+        self.hold_seconds = hold_seconds
+        self.bg_alpha = bg_alpha
+
+        self._bg = None
+        self._small = None
+        self._last_motion_t = None
+        self._last_infer_t = None
+
+        self.checked = 0
+        self.skipped = 0
+        self.last_score = 0.0
+
+    def reset(self):
+        self._bg = None
+        self._last_motion_t = None
+        self._last_infer_t = None
+
+    def motion_score(self, frame_bgr) -> float:
+        """Fraction of (downscaled) pixels that differ from the background."""
+        h, w = frame_bgr.shape[:2]
+        size = (self.width, max(1, int(h * self.width / w)))
+        small = cv2.cvtColor(cv2.resize(frame_bgr, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        small = cv2.GaussianBlur(small, (5, 5), 0)
+
+        if self._bg is None or self._bg.shape != small.shape:
+            self._bg = small.astype(np.float32)
+            return 1.0  # no background yet -> treat as motion
+
+        diff = cv2.absdiff(small, cv2.convertScaleAbs(self._bg))
+        cv2.accumulateWeighted(small, self._bg, self.bg_alpha)
+        return float(np.count_nonzero(diff > self.pixel_thresh)) / diff.size
+
+    def should_infer(self, frame_bgr, now: float, force: bool = False, max_interval: float | None = None) -> bool:
+        self.checked += 1
+        self.last_score = self.motion_score(frame_bgr)
+
+        if self.last_score >= self.motion_ratio:
+            self._last_motion_t = now
+
+        idle_interval = self.idle_interval if max_interval is None else min(self.idle_interval, max_interval)
+        active = self._last_motion_t is not None and (now - self._last_motion_t) <= self.hold_seconds
+        due = self._last_infer_t is None or (now - self._last_infer_t) >= idle_interval
+
+        if force or active or due:
+            self._last_infer_t = now
+            return True
+        self.skipped += 1
+        return False
+
+# ============================================================
+# Person ROI (crop + adaptive input resolution)
+# ============================================================
+class PersonROI:
+    """
+    Tracks the person's bounding box from the previous frame's landmarks and
+    crops the next inference input to it (plus `margin`), downscaled so its
+    longest side is at most `max_side`. Landmarks are remapped back to
+    full-frame normalized coordinates. Falls back to the (downscaled) full
+    frame on track loss and every `full_every` frames.
+    """
+
+    def __init__(
+        self,
+        margin: float = 0.35,
+        min_size: float = 0.2,
+        max_side: int = 480,
+        full_every: int = 30,
+        min_visibility: float = 0.5,
+    ):
+        self.margin = margin
+        self.min_size = min_size
+        self.max_side = max_side
+        self.full_every = full_every
+        self.min_visibility = min_visibility
+
+        self.box = None  # (x0, y0, x1, y1) normalized on the full frame
+        self._frames = 0
+
+    def reset(self):
+        self.box = None
+        self._frames = 0
+
+    def crop(self, frame_bgr):
+        """
+        Returns (input_bgr, rect) where rect = (x, y, w, h) is the crop in
+        full-frame normalized coords.
+        """
+        H, W = frame_bgr.shape[:2]
+        self._frames += 1
+
+        box = self.box
+        if box is None or (self.full_every and self._frames % self.full_every == 0):
+            box = (0.0, 0.0, 1.0, 1.0)
+
+        px0, py0 = int(box[0] * W), int(box[1] * H)
+        px1, py1 = max(px0 + 1, int(math.ceil(box[2] * W))), max(py0 + 1, int(math.ceil(box[3] * H)))
+        crop = frame_bgr[py0:py1, px0:px1]
+
+        ch, cw = crop.shape[:2]
+        scale = self.max_side / max(ch, cw)
+        if scale < 1.0:
+            crop = cv2.resize(crop, (max(1, int(cw * scale)), max(1, int(ch * scale))), interpolation=cv2.INTER_AREA)
+
+        return crop, (px0 / W, py0 / H, (px1 - px0) / W, (py1 - py0) / H)
+
+    def update(self, landmarks, rect):
+        """
+        Remaps landmarks detected on the crop `rect` to full-frame normalized
+        coords (returns an (N, 4) array) and updates the box. None -> track lost.
+        """
+        if landmarks is None:
+            self.box = None
+            return None
+
+        lms = np.array(landmarks, dtype=np.float32) if isinstance(landmarks, np.ndarray) else landmarks_to_array(landmarks)
+        lms[:, 0] = rect[0] + lms[:, 0] * rect[2]
+        lms[:, 1] = rect[1] + lms[:, 1] * rect[3]
+
+        visible = lms[:, 3] >= self.min_visibility
+        if not visible.any():
+            self.box = None
+            return lms
+
+        xs, ys = lms[visible, 0], lms[visible, 1]
+        cx, cy = (xs.min() + xs.max()) / 2.0, (ys.min() + ys.max()) / 2.0
+        half_w = max(xs.max() - xs.min(), self.min_size) * (0.5 + self.margin)
+        half_h = max(ys.max() - ys.min(), self.min_size) * (0.5 + self.margin)
+
+        self.box = (
+            float(np.clip(cx - half_w, 0.0, 1.0)),
+            float(np.clip(cy - half_h, 0.0, 1.0)),
+            float(np.clip(cx + half_w, 0.0, 1.0)),
+            float(np.clip(cy + half_h, 0.0, 1.0)),
+        )
+        return lms
+
+# ============================================================
+# Landmarker factory
+# ============================================================
+def create_pose_landmarker(
+    running_mode=vision.RunningMode.VIDEO,
+    num_poses: int = 1,
+    result_callback=None,
+):
+    """New (unpooled) pose landmarker built from the shared model buffer."""
+    return create_landmarker("pose", running_mode, result_callback=result_callback, num_poses=num_poses)
+
+# ============================================================
+# Pipelined LIVE_STREAM inference
+# ============================================================
+class AsyncPoseLandmarker:
+    """
+    LIVE_STREAM pose landmarker with at most ONE frame in flight.
+
+    submit() returns immediately; while an inference is running new frames
+    are dropped (not queued), so results are never older than one inference.
+    Results go to the handler set with set_handler(fn(result, capture_t, meta)),
+    called on MediaPipe's callback thread; `meta` is whatever was passed to
+    submit() with that frame (e.g. the ROI it was cropped from).
+    """
+
+    def __init__(self, num_poses: int = 1):
+        self._lock = threading.Lock()
+        self._in_flight = False
+        self._pending = {}  # timestamp_ms -> (capture time, meta) of the frame in flight
+        self._last_ts = -1
+        self._handler = None
+
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+
+        self.landmarker = create_pose_landmarker(
+            vision.RunningMode.LIVE_STREAM, num_poses, result_callback=self._on_result
+        )
+
+    def set_handler(self, handler):
+        with self._lock:
+            self._handler = handler
+
+    @property
+    def busy(self) -> bool:
+        return self._in_flight
+
+    def submit(self, frame_bgr, capture_t: float, meta=None) -> bool:
+        """Queues `frame_bgr` for inference unless one is already running."""
+        with self._lock:
+            if self._in_flight:
+                self.dropped += 1
+                return False
+            self._in_flight = True
+            ts = max(int(time.monotonic() * 1000), self._last_ts + 1)
+            self._last_ts = ts
+            self._pending[ts] = (capture_t, meta)
+
+        frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+        try:
+            self.landmarker.detect_async(mp_image, ts)
+        except Exception:
+            with self._lock:
+                self._in_flight = False
+                self._pending.pop(ts, None)
+            raise
+        self.submitted += 1
+        return True
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        with self._lock:
+            pending = self._pending.pop(timestamp_ms, None)
+            handler = self._handler
+            self.completed += 1
+            self._in_flight = False
+        if handler is not None and pending is not None:
+            handler(result, *pending)
+
+    def close(self):
+        self.landmarker.close()
+
 # ============================================================
 # Main loop (THIS is what you import!)
 # ============================================================
-def run_pose_skeleton(camera_index: int = 0, stop_event: threading.Event | None = None) -> bool:
+def run_pose_skeleton(
+    camera_index: int = 0,
+    stop_event: threading.Event | None = None,
+    frame_bus=None,
+    landmarker=None,
+    fall_detector: FallDetector | None = None,
+    headless: bool = False,
+    preview_every: int = 1,
+    stats: dict | None = None,
+    async_inference: bool = False,
+    motion_gate: MotionGate | None = None,
+    person_roi: PersonROI | None = None,
+    recorder=None,
+    multi_tracker=None,
+    clip_buffer=None,
+    pose_listener=None,
+    detect_falls: bool = True,
+) -> bool:
     """
     Runs pose skeleton + fall detection.
 
+    If `frame_bus` (Camera.frame_bus.FrameBus) is given, frames come from the
+    shared bus instead of a private cv2.VideoCapture, so the camera is never
+    closed/re-opened between this and the post-fall checks.
+
+    `landmarker` / `fall_detector` may be passed in to keep them warm across
+    calls (see Body.pose_service.PoseService); they are NOT closed here then.
+
+    Display:
+      headless=True    -> no overlay, no putText, no imshow/waitKey at all
+      preview_every=N  -> window mode renders only every Nth frame
+
+    Inference:
+      async_inference=False -> VIDEO mode, capture and inference in series
+      async_inference=True  -> LIVE_STREAM mode (AsyncPoseLandmarker): capture
+                               keeps running, frames arriving while an
+                               inference is in flight are dropped
+
+    Motion gating:
+      motion_gate=MotionGate() -> static scenes only get keep-alive inference;
+                                  full rate on motion and whenever the
+                                  FallDetector is not in state "OK"
+
+    Input size:
+      person_roi=PersonROI() -> infer on a downscaled crop around the person
+                                tracked from the previous frame; landmarks
+                                are remapped to full-frame coords
+
+    Recording:
+      recorder=Body.recording.LandmarkRecorder(path) -> every decision's
+      landmarks + capture time are appended for offline replay
+      (first person only)
+
+    Several people:
+      multi_tracker=Body.tracking.MultiFallTracker() -> up to max_tracks poses
+      per frame, each matched to a track with its own fall detector; any
+      track confirming a fall ends the run. Not combinable with person_roi.
+
+    Pre-event video:
+      clip_buffer=Camera.clip_buffer.PreEventBuffer() -> every frame is pushed
+      (downscaled, rate-limited, no encoding); after a fall the caller calls
+      clip_buffer.snapshot() to get the last N seconds as JPEGs
+
+    Other consumers of the pose stream:
+      pose_listener=fn(poses, capture_t) -> called after every decision with
+      that frame's poses (MediaPipe landmark lists or (N, 4) arrays, full-frame
+      coords; empty list = no pose)
+      detect_falls=False -> landmarks only, the FallDetector is not updated
+      and the run never ends with a fall
+
+    Per-stage timings go to the "pose" StageTimer (profiling package).
+
+    If `stats` is a dict it is filled on exit with frames / seconds / fps
+    (capture), decisions / decision_fps / dropped / gated (inference) and
+    latency_ms_mean / latency_ms_max (frame capture -> FallDetector decision).
+
     Returns:
       True  -> fall confirmed
       False -> exited for other reason (q pressed / camera ended / stop_event set externally)
@@ -174,80 +533,216 @@ def run_pose_skeleton(camera_index: int = 0, stop_event: threading.Event | None
       - If fall confirmed, sets stop_event (if provided) and exits.
       - If stop_event is set externally (wake word), exits cleanly.
     """
-    base_options = python.BaseOptions(model_asset_path=str(MODEL_PATH))
-    options = vision.PoseLandmarkerOptions(
-        base_options=base_options,
-        running_mode=vision.RunningMode.VIDEO,
-        num_poses=1,
-        min_pose_detection_confidence=0.6,
-        min_pose_presence_confidence=0.6,
-        min_tracking_confidence=0.6,
-    )
-
-    landmarker = vision.PoseLandmarker.create_from_options(options)
-
-    cap = cv2.VideoCapture(camera_index)
+    if multi_tracker is not None and person_roi is not None:
+        raise ValueError("person_roi tracks a single person; drop it when using multi_tracker")
+
+    num_poses = 1 if multi_tracker is None else multi_tracker.max_tracks
+    owns_landmarker = landmarker is None
+    if owns_landmarker:
+        if async_inference:
+            landmarker = AsyncPoseLandmarker(num_poses)
+        else:
+            # pooled: repeated calls reuse the initialised graph
+            landmarker = acquire_landmarker("pose", vision.RunningMode.VIDEO, num_poses=num_poses)
+
+    def close_landmarker():
+        if not owns_landmarker:
+            return
+        if async_inference:
+            landmarker.close()
+        else:
+            release_landmarker(landmarker)
+
+    cap = frame_bus.subscribe() if frame_bus is not None else cv2.VideoCapture(camera_index)
     if not cap.isOpened():
-        landmarker.close()
+        close_landmarker()
         raise RuntimeError("Could not open camera")
 
-    fall_detector = FallDetector()
-    start_time = time.time()
+    if fall_detector is None:
+        fall_detector = FallDetector()
+    last_timestamp_ms = -1
     fell_triggered = False
+    preview_every = max(1, int(preview_every))
+    frame_count = 0
+    gated = 0
+    loop_start = time.monotonic()
+
+    # decision bookkeeping (written from the MediaPipe thread in async mode)
+    fell_event = threading.Event()
+    latest = {"poses": [], "info": None}
+    lat = {"n": 0, "sum": 0.0, "max": 0.0}
+
+    def decide(poses, capture_t):
+        if fell_event.is_set():
+            return
+        if recorder is not None:
+            recorder.write(capture_t, poses[0] if poses else None)
+
+        # capture time, not arrival time -> replays see the same dt
+        if not detect_falls:
+            fell, info = False, None
+        elif multi_tracker is not None:
+            tracks = multi_tracker.update(poses, capture_t)
+            fell = any(t.fell for t in tracks)
+            info = {"state": f"{len(tracks)} people", "tracks": tracks}
+        elif poses:
+            fell, info = fall_detector.update(poses[0], now=capture_t)
+        else:
+            fell, info = False, None
+        if fell:
+            fell_event.set()
+
+        latency = time.monotonic() - capture_t
+        lat["n"] += 1
+        lat["sum"] += latency
+        lat["max"] = max(lat["max"], latency)
+        latest["poses"], latest["info"] = poses, info
+        if pose_listener is not None:
+            pose_listener(poses, capture_t)
+
+    def on_result(result, capture_t, rect):
+        poses = list(result.pose_landmarks or [])
+        if person_roi is not None:
+            pose = person_roi.update(poses[0] if poses else None, rect)
+            poses = [] if pose is None else [pose]
+        elif multi_tracker is not None:
+            poses = [landmarks_to_array(p) for p in poses]
+        decide(poses, capture_t)
+
+    timer = get_stage_timer("pose")
+
+    def on_result_async(result, capture_t, rect):
+        t0 = time.perf_counter()
+        on_result(result, capture_t, rect)
+        timer.record("fall_update", time.perf_counter() - t0)
+
+    if async_inference:
+        landmarker.set_handler(on_result_async)
 
     try:
         while True:
             if stop_event is not None and stop_event.is_set():
                 break
 
+            timer.start()
             ret, frame = cap.read()
             if not ret:
                 break
+            capture_t = getattr(cap, "last_timestamp", None) or time.monotonic()
+            frame_count += 1
+            timer.lap("read")
+
+            if clip_buffer is not None:
+                clip_buffer.push(frame, capture_t)
+                timer.lap("clip_push")
+
+            if motion_gate is not None and not motion_gate.should_infer(
+                frame,
+                capture_t,
+                force=multi_tracker.alerting if multi_tracker is not None else fall_detector.state != "OK",
+                max_interval=fall_detector.shock_window_sec,
+            ):
+                gated += 1
+                timer.lap("motion_gate")
+            else:
+                if motion_gate is not None:
+                    timer.lap("motion_gate")
+                if person_roi is not None:
+                    infer_frame, rect = person_roi.crop(frame)
+                    timer.lap("roi_crop")
+                else:
+                    infer_frame, rect = frame, None
+
+                if async_inference:
+                    landmarker.submit(infer_frame, capture_t, rect)
+                    timer.lap("submit")
+                else:
+                    frame_rgb = cv2.cvtColor(infer_frame, cv2.COLOR_BGR2RGB)
+                    timer.lap("cvt_color")
+                    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+                    timer.lap("mp_image")
+
+                    # VIDEO mode needs strictly increasing timestamps, also across
+                    # calls that share one landmarker -> use the monotonic clock
+                    timestamp_ms = max(int(time.monotonic() * 1000), last_timestamp_ms + 1)
+                    last_timestamp_ms = timestamp_ms
+                    result = landmarker.detect_for_video(mp_image, timestamp_ms)
+                    timer.lap("detect")
+                    on_result(result, capture_t, rect)
+                    timer.lap("fall_update")
+
+            if fell_event.is_set():
+                fell_triggered = True
+                if stop_event is not None:
+                    stop_event.set()
+                break
 
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
-
-            timestamp_ms = int((time.time() - start_time) * 1000)
-            result = landmarker.detect_for_video(mp_image, timestamp_ms)
-
-            if result.pose_landmarks:
-                draw_pose_skeleton(frame, result.pose_landmarks[0])
-                fell, info = fall_detector.update(result.pose_landmarks[0])
-
-                if fell:
-                    fell_triggered = True
-                    cv2.putText(frame, "FALL DETECTED!", (30, 60),
-                                cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 3)
-                    if stop_event is not None:
-                        stop_event.set()
-                    # show the frame for a moment if you want; otherwise exit immediately
-                    # cv2.imshow("MediaPipe Pose Skeleton", frame); cv2.waitKey(1)
-                    break
-
-                cv2.putText(
-                    frame,
-                    f'{info.get("state","?")} vy={info.get("hip_vy",0.0):.2f}',
-                    (20, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    (255, 255, 255),
-                    2
-                )
+            poses, info = latest["poses"], latest["info"]
+
+            if headless or frame_count % preview_every != 0:
+                continue
+
+            # ------------ preview ------------
+            if frame_bus is not None:
+                frame = frame.copy()  # bus frames are shared; never draw on them
+
+            if poses:
+                for pose in poses:
+                    draw_pose_skeleton(frame, pose)
+                for track in (info or {}).get("tracks", []):
+                    if track.hip_y is None:
+                        continue
+                    hx = float(poses[track.pose_index][23:25, 0].mean()) * frame.shape[1]
+                    cv2.putText(frame, f"#{track.track_id} {track.state}",
+                                (int(hx), int(track.hip_y * frame.shape[0])),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+                # info is None while fall detection is off (detect_falls=False)
+                if info is not None:
+                    cv2.putText(
+                        frame,
+                        f'{info.get("state","?")} vy={info.get("hip_vy",0.0):.2f}',
+                        (20, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX,
+                        0.7,
+                        (255, 255, 255),
+                        2
+                    )
             else:
                 cv2.putText(frame, "No pose", (20, 30),
                             cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            timer.lap("draw")
 
             cv2.imshow("MediaPipe Pose Skeleton", frame)
+            key = cv2.waitKey(1) & 0xFF
+            timer.lap("display")
 
-            if cv2.waitKey(1) & 0xFF == ord("q"):
+            if key == ord("q"):
                 if stop_event is not None:
                     stop_event.set()
                 break
 
     finally:
+        if async_inference:
+            landmarker.set_handler(None)
         cap.release()
-        cv2.destroyAllWindows()
-        landmarker.close()
+        if not headless:
+            cv2.destroyAllWindows()
+        close_landmarker()
+
+        if stats is not None:
+            elapsed = time.monotonic() - loop_start
+            n = lat["n"]
+            stats.update({
+                "frames": frame_count,
+                "seconds": elapsed,
+                "fps": frame_count / elapsed if elapsed > 0 else 0.0,
+                "decisions": n,
+                "decision_fps": n / elapsed if elapsed > 0 else 0.0,
+                "dropped": landmarker.dropped if async_inference else 0,
+                "gated": gated,
+                "latency_ms_mean": 1000.0 * lat["sum"] / n if n else 0.0,
+                "latency_ms_max": 1000.0 * lat["max"],
+            })
 
     return fell_triggered
 
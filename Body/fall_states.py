@@ -0,0 +1,94 @@
+"""
+FallDetector's thresholds and its state machine as NumPy arrays, shared by
+the live multi-person tracker (Body.tracking) and the offline threshold
+sweep (Body.sweep). Kept free of OpenCV / MediaPipe so sweep worker
+processes stay light.
+"""
+import numpy as np
+
+# Sweepable FallDetector attributes and their current defaults
+THRESHOLDS = {
+    "hip_drop_vy_thresh": 0.55,
+    "shock_drop_thresh": 0.12,
+    "shock_window_sec": 0.30,
+    "low_hip_y_thresh": 0.72,
+    "confirm_seconds": 0.45,
+}
+
+# Constants hard-coded in FallDetector.update
+FAST_DROP_MIN_HIP_Y = 0.55
+POSSIBLE_FALL_TIMEOUT = 0.9
+
+OK, POSSIBLE_FALL, FALL_CONFIRMED = 0, 1, 2
+
+
+# ============================================================
+# Vectorized state machine
+# ============================================================
+class FallStates:
+    """
+    FallDetector state for many detectors at once, stored as arrays of any
+    shape (e.g. (P, S) for a sweep, (K,) for per-track detectors).
+    """
+
+    def __init__(self, shape):
+        self.state = np.zeros(shape, dtype=np.int8)
+        self.prev_t = np.full(shape, np.nan)
+        self.prev_y = np.full(shape, np.nan)
+        self.trigger = np.full(shape, np.nan)
+
+    def reset(self, mask):
+        """Back to a fresh FallDetector wherever `mask` is True."""
+        self.state[mask] = OK
+        self.prev_t[mask] = np.nan
+        self.prev_y[mask] = np.nan
+        self.trigger[mask] = np.nan
+
+    def step(self, now, y, thresholds: dict) -> np.ndarray:
+        """
+        One FallDetector.update(now=...) for every element.
+
+        now: frame time, NaN = no update for that element
+        y:   mean hip y, NaN = hips not visible (only the clock advances)
+        thresholds: name -> value/array broadcastable to the state shape
+
+        Returns a bool array: True where a fall was confirmed on this step.
+        """
+        thr = {name: thresholds.get(name, default) for name, default in THRESHOLDS.items()}
+        state, prev_t, prev_y, trigger = self.state, self.prev_t, self.prev_y, self.trigger
+
+        has_frame = ~np.isnan(now)
+        prev_t = np.where(has_frame & np.isnan(prev_t), now, prev_t)
+        dt = np.maximum(1e-3, now - prev_t)
+
+        upd = has_frame & ~np.isnan(y)
+        has_prev = upd & ~np.isnan(prev_y)
+
+        with np.errstate(invalid="ignore"):
+            drop = np.where(has_prev, y - prev_y, 0.0)
+            vy = drop / dt
+            fast = upd & (vy > thr["hip_drop_vy_thresh"])
+            shock = has_prev & (dt <= thr["shock_window_sec"]) & (drop > thr["shock_drop_thresh"])
+            low = upd & (y > thr["low_hip_y_thresh"])
+            since = now - trigger
+
+            # OK -> POSSIBLE_FALL
+            go_possible = upd & (state == OK) & (shock | (fast & (y > FAST_DROP_MIN_HIP_Y)))
+            # POSSIBLE_FALL -> FALL_CONFIRMED / OK
+            in_possible = upd & (state == POSSIBLE_FALL) & ~np.isnan(trigger)
+            go_confirm = in_possible & low & (since >= thr["confirm_seconds"])
+            go_ok = in_possible & ~low & ~fast & (since > POSSIBLE_FALL_TIMEOUT)
+            # FALL_CONFIRMED is one-shot
+            go_reset = upd & (state == FALL_CONFIRMED)
+
+        state = np.where(go_possible, POSSIBLE_FALL, state)
+        trigger = np.where(go_possible, now, trigger)
+        state = np.where(go_confirm, FALL_CONFIRMED, state)
+        state = np.where(go_ok | go_reset, OK, state)
+        trigger = np.where(go_ok | go_reset, np.nan, trigger)
+
+        self.state = state.astype(np.int8, copy=False)
+        self.trigger = trigger
+        self.prev_t = np.where(has_frame, now, prev_t)
+        self.prev_y = np.where(upd, y, prev_y)
+        return go_confirm
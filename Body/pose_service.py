@@ -0,0 +1,225 @@
+import time
+import threading
+from typing import Callable, Optional
+
+from Body.body import (
+    AsyncPoseLandmarker,
+    FallDetector,
+    MotionGate,
+    PersonROI,
+    create_pose_landmarker,
+    run_pose_skeleton,
+)
+from Body.tracking import MultiFallTracker
+from Camera.frame_bus import get_frame_bus
+
+# ============================================================
+# Resident pose service
+# ============================================================
+class PoseService:
+    """
+    Long-lived pose + fall detection worker.
+
+    The landmarker, the camera (via the shared FrameBus) and the
+    FallDetector are created once in start() and stay warm across trigger
+    cycles; pause()/resume() only gate the processing loop.
+
+    Usage:
+        svc = PoseService(0).start()
+        svc.subscribe(on_fall)   # called on the service thread
+        svc.resume()
+        ...
+        svc.pause()
+        svc.stop()
+
+    Pose listeners (add_pose_listener) get every frame's landmarks, e.g. for
+    the post-fall response check; resume(detect_falls=False) keeps the
+    landmarks flowing without fall detection.
+    """
+
+    def __init__(
+        self,
+        camera_index: int = 0,
+        frame_bus=None,
+        pause_on_fall: bool = True,
+        headless: bool = False,
+        preview_every: int = 1,
+        async_inference: bool = False,
+        motion_gating: bool = False,
+        roi_tracking: bool = False,
+        recorder=None,
+        max_people: int = 1,
+        clip_buffer=None,
+    ):
+        self.camera_index = camera_index
+        self.frame_bus = frame_bus
+        self.pause_on_fall = pause_on_fall
+        self.headless = headless
+        self.preview_every = preview_every
+        self.async_inference = async_inference
+
+        self.landmarker = None
+        self.fall_detector = FallDetector()
+        self.motion_gate = MotionGate() if motion_gating else None
+        self.person_roi = PersonROI() if roi_tracking else None
+        self.recorder = recorder  # Body.recording.LandmarkRecorder, optional
+        self.multi_tracker = MultiFallTracker(max_tracks=max_people) if max_people > 1 else None
+
+        # Camera.clip_buffer.PreEventBuffer, optional; last_clip is a
+        # Future[EventClip] for the most recent fall
+        self.clip_buffer = clip_buffer
+        self.last_clip = None
+
+        self._callbacks: list[Callable[[], None]] = []
+        self._pose_listeners: list[Callable] = []
+        self._cb_lock = threading.Lock()
+        self._detect_falls = True
+
+        self._active = threading.Event()       # set -> processing frames
+        self._cycle_stop = threading.Event()   # set -> break out of the current run
+        self._shutdown = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------ lifecycle ------------
+    def start(self, paused: bool = True) -> "PoseService":
+        """Loads the model and opens the camera. Starts paused by default."""
+        if self._thread is not None:
+            return self
+
+        if self.frame_bus is None:
+            self.frame_bus = get_frame_bus(self.camera_index)
+        num_poses = 1 if self.multi_tracker is None else self.multi_tracker.max_tracks
+        if self.async_inference:
+            self.landmarker = AsyncPoseLandmarker(num_poses)
+        else:
+            self.landmarker = create_pose_landmarker(num_poses=num_poses)
+
+        self._shutdown.clear()
+        if not paused:
+            self._active.set()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def pause(self):
+        self._active.clear()
+        self._cycle_stop.set()
+
+    def resume(self, detect_falls: bool = True):
+        """detect_falls=False: landmarks only (pose listeners), no fall events."""
+        if self._active.is_set():
+            if detect_falls == self._detect_falls:
+                return
+            self.pause()  # switch mode -> restart the cycle
+        self._detect_falls = detect_falls
+        self.fall_detector.reset()  # history across a pause is meaningless
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
+        if self.person_roi is not None:
+            self.person_roi.reset()
+        if self.multi_tracker is not None:
+            self.multi_tracker.reset()
+        if self.clip_buffer is not None:
+            self.clip_buffer.clear()  # never attach footage from before the pause
+        self._cycle_stop = threading.Event()
+        self._active.set()
+
+    def stop(self):
+        self._shutdown.set()
+        self.pause()
+        self._active.set()  # wake the loop so it can see _shutdown
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self.landmarker is not None:
+            self.landmarker.close()
+            self.landmarker = None
+        if self.clip_buffer is not None:
+            self.clip_buffer.close()
+        self._active.clear()
+
+    @property
+    def paused(self) -> bool:
+        return not self._active.is_set()
+
+    # ------------ fall event subscribers ------------
+    def subscribe(self, callback: Callable[[], None]):
+        with self._cb_lock:
+            self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: Callable[[], None]):
+        with self._cb_lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    # ------------ pose listeners ------------
+    def add_pose_listener(self, listener: Callable):
+        """listener(poses, capture_t), called on the inference thread."""
+        with self._cb_lock:
+            self._pose_listeners.append(listener)
+
+    def remove_pose_listener(self, listener: Callable):
+        with self._cb_lock:
+            if listener in self._pose_listeners:
+                self._pose_listeners.remove(listener)
+
+    def _emit_pose(self, poses, capture_t):
+        with self._cb_lock:
+            listeners = list(self._pose_listeners)
+        for fn in listeners:
+            try:
+                fn(poses, capture_t)
+            except Exception as e:
+                print("PoseService pose listener error:", e)
+
+    def _emit_fall(self):
+        with self._cb_lock:
+            callbacks = list(self._callbacks)
+        for cb in callbacks:
+            try:
+                cb()
+            except Exception as e:
+                print("PoseService callback error:", e)
+
+    # ------------ worker ------------
+    def _loop(self):
+        while not self._shutdown.is_set():
+            self._active.wait()
+            if self._shutdown.is_set():
+                break
+
+            cycle_stop = self._cycle_stop
+            try:
+                fell = run_pose_skeleton(
+                    self.camera_index,
+                    cycle_stop,
+                    frame_bus=self.frame_bus,
+                    landmarker=self.landmarker,
+                    fall_detector=self.fall_detector,
+                    headless=self.headless,
+                    preview_every=self.preview_every,
+                    async_inference=self.async_inference,
+                    motion_gate=self.motion_gate,
+                    person_roi=self.person_roi,
+                    recorder=self.recorder,
+                    multi_tracker=self.multi_tracker,
+                    clip_buffer=self.clip_buffer,
+                    pose_listener=self._emit_pose,
+                    detect_falls=self._detect_falls,
+                )
+            except Exception as e:
+                print("PoseService error:", e)
+                time.sleep(0.5)
+                continue
+
+            if fell:
+                # pause BEFORE notifying so a quick resume() from a callback
+                # or the orchestrator is not undone afterwards
+                if self.pause_on_fall:
+                    self._active.clear()
+                if self.clip_buffer is not None:
+                    self.last_clip = self.clip_buffer.snapshot()
+                self._emit_fall()
+            elif cycle_stop.is_set() and self._active.is_set() and cycle_stop is self._cycle_stop:
+                # stopped from inside (e.g. 'q' in the preview) -> pause
+                self._active.clear()
@@ -0,0 +1,155 @@
+"""
+Compact pose landmark recordings + faster-than-realtime FallDetector replay.
+
+File layout (little endian):
+  header  16 bytes : b"CAMMPOSE" | uint32 version | uint32 num_landmarks
+  records N x      : float64 t | uint8 valid | float32[num_landmarks, 4] (x, y, z, visibility)
+
+`t` is the capture time in seconds (monotonic base). Records are fixed size,
+so the body can be memory-mapped as one structured NumPy array.
+
+  python -m Body.recording replay session.pose
+"""
+import os
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from Body.body import FallDetector, landmarks_to_array
+
+MAGIC = b"CAMMPOSE"
+VERSION = 1
+NUM_LANDMARKS = 33
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("num_landmarks", "<u4")])
+
+
+def record_dtype(num_landmarks: int = NUM_LANDMARKS) -> np.dtype:
+    return np.dtype([("t", "<f8"), ("valid", "u1"), ("lm", "<f4", (num_landmarks, 4))])
+
+
+# ============================================================
+# Recorder
+# ============================================================
+class LandmarkRecorder:
+    """
+    Appends one fixed-size record per processed frame. `landmarks` None
+    (no pose) is stored as valid=0 so gaps are kept in the timeline.
+
+    Usage:
+        with LandmarkRecorder("session.pose") as rec:
+            run_pose_skeleton(..., recorder=rec)
+    """
+
+    def __init__(self, path, num_landmarks: int = NUM_LANDMARKS, flush_every: int = 64):
+        self.path = str(path)
+        self.num_landmarks = num_landmarks
+        self.flush_every = flush_every
+        self.count = 0
+
+        self._rec = np.zeros(1, dtype=record_dtype(num_landmarks))  # reused per write
+        self._f = open(self.path, "wb")
+        header = np.array([(MAGIC, VERSION, num_landmarks)], dtype=HEADER_DTYPE)
+        self._f.write(header.tobytes())
+
+    def write(self, t: float, landmarks):
+        rec = self._rec[0]
+        rec["t"] = t
+        if landmarks is None:
+            rec["valid"] = 0
+            rec["lm"] = 0.0
+        else:
+            lms = landmarks if isinstance(landmarks, np.ndarray) else landmarks_to_array(landmarks)
+            rec["valid"] = 1
+            rec["lm"] = lms[: self.num_landmarks]
+        self._f.write(self._rec.tobytes())
+
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self._f.flush()
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_recording(path) -> np.ndarray:
+    """Memory-maps a recording; returns a structured array with t / valid / lm."""
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) != 1 or header[0]["magic"] != MAGIC:
+        raise ValueError(f"Not a pose recording: {path}")
+    if header[0]["version"] != VERSION:
+        raise ValueError(f"Unsupported recording version {header[0]['version']}: {path}")
+
+    dtype = record_dtype(int(header[0]["num_landmarks"]))
+    body = os.path.getsize(path) - HEADER_DTYPE.itemsize
+    count = body // dtype.itemsize  # ignore a torn trailing record
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=HEADER_DTYPE.itemsize, shape=(count,))
+
+
+# ============================================================
+# Replay
+# ============================================================
+@dataclass
+class ReplayResult:
+    frames: int
+    recorded_seconds: float
+    wall_seconds: float
+    fall_times: list = field(default_factory=list)  # recording timestamps of confirmed falls
+
+    @property
+    def speedup(self) -> float:
+        return self.recorded_seconds / self.wall_seconds if self.wall_seconds > 0 else float("inf")
+
+
+def replay(recording, detector: FallDetector | None = None, **thresholds) -> ReplayResult:
+    """
+    Drives a FallDetector from recorded timestamps as fast as possible.
+    `recording` is a path or a load_recording() array; keyword args override
+    detector attributes (e.g. shock_drop_thresh=0.1).
+    """
+    recs = load_recording(recording) if isinstance(recording, (str, os.PathLike)) else recording
+    if detector is None:
+        detector = FallDetector()
+    for name, value in thresholds.items():
+        if not hasattr(detector, name):
+            raise AttributeError(f"FallDetector has no threshold '{name}'")
+        setattr(detector, name, value)
+
+    ts = np.asarray(recs["t"], dtype=np.float64)
+    valid = np.asarray(recs["valid"], dtype=bool)
+    lms = recs["lm"]
+
+    falls = []
+    start = time.perf_counter()
+    for i in np.flatnonzero(valid):
+        fell, _ = detector.update(lms[i], now=float(ts[i]))
+        if fell:
+            falls.append(float(ts[i]))
+    wall = time.perf_counter() - start
+
+    recorded = float(ts[-1] - ts[0]) if len(ts) > 1 else 0.0
+    return ReplayResult(frames=len(recs), recorded_seconds=recorded, wall_seconds=wall, fall_times=falls)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("command", choices=["replay"])
+    ap.add_argument("path")
+    args = ap.parse_args()
+
+    res = replay(args.path)
+    print(f"frames={res.frames} recorded={res.recorded_seconds:.1f}s "
+          f"wall={res.wall_seconds * 1000:.1f}ms speedup={res.speedup:.0f}x")
+    for t in res.fall_times:
+        print(f"  fall confirmed at t={t:.3f}")
@@ -0,0 +1,277 @@
+"""
+Vectorized FallDetector evaluation + parallel threshold sweep.
+
+batch_fall_detect() runs the same state machine as Body.body.FallDetector
+over S hip trajectories x P threshold settings at once (NumPy arrays of
+shape (P, S), one Python step per frame). sweep() spreads a threshold grid
+over a process pool and reports, per setting, detection rate / latency on
+falls and false-positive rate on non-falls.
+
+  python -m Body.sweep                       # synthetic fall/sit/bend data
+  python -m Body.sweep --recording a.pose    # + recorded sessions (counted as non-falls)
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from Body.fall_states import THRESHOLDS, FallStates
+
+
+# ============================================================
+# Trajectories
+# ============================================================
+@dataclass
+class Trajectories:
+    """
+    t      (S, T) capture times in seconds; NaN = no frame (padding / no pose)
+    hip_y  (S, T) mean hip y (normalized, down is +); NaN = low visibility
+    is_fall (S,) bool, onset (S,) fall onset time (NaN for non-falls)
+    """
+    t: np.ndarray
+    hip_y: np.ndarray
+    is_fall: np.ndarray
+    onset: np.ndarray
+    kind: np.ndarray
+
+    def __len__(self):
+        return len(self.t)
+
+
+def _ease(x):
+    # smooth 0 -> 1 step (cosine)
+    x = np.clip(x, 0.0, 1.0)
+    return 0.5 - 0.5 * np.cos(np.pi * x)
+
+
+def synthesize(
+    n_per_kind: int = 200,
+    seconds: float = 6.0,
+    fps: float = 30.0,
+    dropout: float = 0.02,
+    seed: int = 0,
+) -> Trajectories:
+    """
+    Synthetic hip trajectories:
+      fall -> standing, drops 0.25-0.40 within 0.25-0.7 s, stays on the floor
+      sit  -> lowers 0.10-0.18 over 0.8-1.6 s and stays (sitting down)
+      bend -> lowers 0.05-0.12 over 0.6-1.2 s and comes back up
+    with per-frame noise, timing jitter and random low-visibility frames.
+    """
+    rng = np.random.default_rng(seed)
+    T = int(seconds * fps)
+    kinds = np.repeat(np.array(["fall", "sit", "bend"]), n_per_kind)
+    S = len(kinds)
+
+    jitter = rng.normal(0.0, 0.15 / fps, size=(S, T))
+    t = np.arange(T)[None, :] / fps + jitter
+    t = np.maximum.accumulate(t, axis=1)  # keep timestamps non-decreasing
+
+    base = rng.uniform(0.42, 0.58, size=(S, 1))
+    onset = rng.uniform(1.0, seconds - 3.0, size=(S, 1))
+
+    depth = np.empty((S, 1))
+    dur = np.empty((S, 1))
+    falls, sits, bends = kinds == "fall", kinds == "sit", kinds == "bend"
+    depth[falls] = rng.uniform(0.25, 0.40, size=(falls.sum(), 1))
+    dur[falls] = rng.uniform(0.25, 0.7, size=(falls.sum(), 1))
+    depth[sits] = rng.uniform(0.10, 0.18, size=(sits.sum(), 1))
+    dur[sits] = rng.uniform(0.8, 1.6, size=(sits.sum(), 1))
+    depth[bends] = rng.uniform(0.05, 0.12, size=(bends.sum(), 1))
+    dur[bends] = rng.uniform(0.6, 1.2, size=(bends.sum(), 1))
+
+    phase = (t - onset) / dur
+    shape = _ease(phase)
+    # bends come back up: down for the first half, up for the second
+    shape[bends] = _ease(2.0 * phase[bends]) - _ease(2.0 * phase[bends] - 1.0)
+
+    hip_y = base + depth * shape + rng.normal(0.0, 0.004, size=(S, T))
+    hip_y[rng.random((S, T)) < dropout] = np.nan
+
+    return Trajectories(
+        t=t,
+        hip_y=hip_y,
+        is_fall=falls,
+        onset=np.where(falls, onset[:, 0], np.nan),
+        kind=kinds,
+    )
+
+
+def from_recordings(paths, min_visibility: float = 0.4) -> Trajectories:
+    """Hip trajectories from Body.recording files (treated as non-fall sessions)."""
+    from Body.recording import load_recording
+
+    seqs = []
+    for path in paths:
+        recs = load_recording(path)
+        t = np.where(recs["valid"] == 1, recs["t"], np.nan)
+        hips = recs["lm"][:, 23:25]
+        vis_ok = (hips[:, :, 3] >= min_visibility).all(axis=1)
+        hip_y = np.where(vis_ok, hips[:, :, 1].mean(axis=1), np.nan)
+        seqs.append((t, hip_y))
+
+    T = max(len(t) for t, _ in seqs)
+    S = len(seqs)
+    t_all = np.full((S, T), np.nan)
+    y_all = np.full((S, T), np.nan)
+    for i, (t, y) in enumerate(seqs):
+        t_all[i, : len(t)] = t
+        y_all[i, : len(y)] = y
+
+    return Trajectories(
+        t=t_all, hip_y=y_all,
+        is_fall=np.zeros(S, dtype=bool), onset=np.full(S, np.nan),
+        kind=np.array(["recording"] * S),
+    )
+
+
+def concat(*trajs: Trajectories) -> Trajectories:
+    T = max(tr.t.shape[1] for tr in trajs)
+
+    def pad(a):
+        return np.pad(a, ((0, 0), (0, T - a.shape[1])), constant_values=np.nan)
+
+    return Trajectories(
+        t=np.concatenate([pad(tr.t) for tr in trajs]),
+        hip_y=np.concatenate([pad(tr.hip_y) for tr in trajs]),
+        is_fall=np.concatenate([tr.is_fall for tr in trajs]),
+        onset=np.concatenate([tr.onset for tr in trajs]),
+        kind=np.concatenate([tr.kind for tr in trajs]),
+    )
+
+
+def batch_fall_detect(t: np.ndarray, hip_y: np.ndarray, params: dict) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Runs FallDetector.update semantics over every (setting, sequence) pair.
+
+    t, hip_y: (S, T) as in Trajectories.
+    params:   threshold name -> (P,) array (missing names use the defaults).
+
+    Returns (first_fall_t, fall_count), both (P, S); first_fall_t is NaN
+    where no fall was confirmed.
+    """
+    P = len(next(iter(params.values()))) if params else 1
+    S, T = t.shape
+
+    thresholds = {
+        name: np.asarray(params[name], dtype=np.float64).reshape(P, 1)
+        for name in THRESHOLDS if name in params
+    }
+
+    states = FallStates((P, S))
+    first_fall = np.full((P, S), np.nan)
+    count = np.zeros((P, S), dtype=np.int32)
+
+    for k in range(T):
+        now = np.broadcast_to(t[:, k], (P, S))
+        y = np.broadcast_to(hip_y[:, k], (P, S))
+
+        confirmed = states.step(now, y, thresholds)
+        first_fall = np.where(confirmed & np.isnan(first_fall), now, first_fall)
+        count += confirmed
+
+    return first_fall, count
+
+
+# ============================================================
+# Sweep
+# ============================================================
+def _evaluate_chunk(args):
+    t, hip_y, is_fall, onset, chunk = args
+    first, count = batch_fall_detect(t, hip_y, chunk)
+
+    latency = first[:, is_fall] - onset[is_fall][None, :]
+    detected = ~np.isnan(latency)
+    n_fall = max(1, int(is_fall.sum()))
+    n_other = max(1, int((~is_fall).sum()))
+
+    n_detected = detected.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_latency = np.where(detected, latency, 0.0).sum(axis=1) / n_detected
+    return {
+        "detection_rate": n_detected / n_fall,
+        "mean_latency": mean_latency,
+        "false_positive_rate": (count[:, ~is_fall] > 0).sum(axis=1) / n_other,
+    }
+
+
+def sweep(
+    grid: dict,
+    trajectories: Trajectories,
+    processes: int | None = None,
+    chunk_size: int = 64,
+) -> list[dict]:
+    """
+    grid: threshold name -> list of values; every combination is evaluated.
+    Returns one dict per setting with the thresholds plus detection_rate,
+    mean_latency (s, falls only) and false_positive_rate, best first.
+    """
+    names = list(grid)
+    combos = np.array(list(itertools.product(*(grid[n] for n in names))), dtype=np.float64)
+    if len(combos) == 0:
+        return []
+
+    tr = trajectories
+    jobs = []
+    for start in range(0, len(combos), chunk_size):
+        part = combos[start:start + chunk_size]
+        chunk = {n: part[:, i] for i, n in enumerate(names)}
+        jobs.append((tr.t, tr.hip_y, tr.is_fall, tr.onset, chunk))
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(jobs) == 1:
+        parts = [_evaluate_chunk(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(jobs))) as pool:
+            parts = list(pool.map(_evaluate_chunk, jobs))
+
+    rows = []
+    for part_start, part in zip(range(0, len(combos), chunk_size), parts):
+        for j in range(len(part["detection_rate"])):
+            row = {n: float(combos[part_start + j, i]) for i, n in enumerate(names)}
+            row["detection_rate"] = float(part["detection_rate"][j])
+            row["mean_latency"] = float(part["mean_latency"][j])
+            row["false_positive_rate"] = float(part["false_positive_rate"][j])
+            rows.append(row)
+
+    rows.sort(key=lambda r: (
+        -(r["detection_rate"] - r["false_positive_rate"]),
+        np.inf if np.isnan(r["mean_latency"]) else r["mean_latency"],
+    ))
+    return rows
+
+
+DEFAULT_GRID = {
+    "hip_drop_vy_thresh": [0.35, 0.45, 0.55, 0.65, 0.8],
+    "shock_drop_thresh": [0.08, 0.10, 0.12, 0.15],
+    "low_hip_y_thresh": [0.66, 0.69, 0.72, 0.75],
+    "confirm_seconds": [0.3, 0.45, 0.6, 0.8],
+}
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=200, help="synthetic sequences per kind")
+    ap.add_argument("--processes", type=int, default=None)
+    ap.add_argument("--recording", action="append", default=[], help="Body.recording file (non-fall)")
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+
+    data = synthesize(args.n)
+    if args.recording:
+        data = concat(data, from_recordings(args.recording))
+
+    t0 = time.perf_counter()
+    results = sweep(DEFAULT_GRID, data, processes=args.processes)
+    elapsed = time.perf_counter() - t0
+    print(f"{len(results)} settings x {len(data)} sequences in {elapsed:.1f}s")
+
+    cols = list(DEFAULT_GRID) + ["detection_rate", "mean_latency", "false_positive_rate"]
+    print(" ".join(f"{c[:12]:>12s}" for c in cols))
+    for row in results[: args.top]:
+        print(" ".join(f"{row[c]:12.3f}" for c in cols))
@@ -0,0 +1,206 @@
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+
+from Body.fall_states import THRESHOLDS, FallStates, FALL_CONFIRMED, POSSIBLE_FALL
+
+try:
+    # optional: exact Hungarian solver; a small brute-force/greedy fallback is used otherwise
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+STATE_NAMES = {0: "OK", POSSIBLE_FALL: "POSSIBLE_FALL", FALL_CONFIRMED: "FALL_CONFIRMED"}
+
+
+# ============================================================
+# Assignment
+# ============================================================
+def _assign(cost: np.ndarray) -> list[tuple[int, int]]:
+    """
+    Detection -> track matching on a (D, K) cost matrix (inf = not allowed).
+    Nearest neighbour when every detection picks a different track, otherwise
+    an optimal assignment.
+    """
+    D, K = cost.shape
+    if D == 0 or K == 0:
+        return []
+
+    nn = cost.argmin(axis=1)
+    finite = np.isfinite(cost[np.arange(D), nn])
+    picks = nn[finite]
+    if len(np.unique(picks)) == len(picks):
+        return [(int(d), int(nn[d])) for d in np.flatnonzero(finite)]
+
+    big = 1e6
+    c = np.where(np.isfinite(cost), cost, big)
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(c)
+        pairs = zip(rows.tolist(), cols.tolist())
+    elif min(D, K) <= 6:
+        # tiny problems: exhaustive search is cheap (<= 720 permutations)
+        best, pairs = None, []
+        if D <= K:
+            for perm in itertools.permutations(range(K), D):
+                total = c[np.arange(D), perm].sum()
+                if best is None or total < best:
+                    best, pairs = total, list(zip(range(D), perm))
+        else:
+            for perm in itertools.permutations(range(D), K):
+                total = c[perm, np.arange(K)].sum()
+                if best is None or total < best:
+                    best, pairs = total, list(zip(perm, range(K)))
+    else:
+        # greedy on globally sorted costs
+        pairs, used_d, used_k = [], set(), set()
+        for flat in np.argsort(c, axis=None):
+            d, k = divmod(int(flat), K)
+            if d not in used_d and k not in used_k:
+                pairs.append((d, k))
+                used_d.add(d)
+                used_k.add(k)
+
+    return [(int(d), int(k)) for d, k in pairs if c[d, k] < big]
+
+
+# ============================================================
+# Multi-person fall tracker
+# ============================================================
+@dataclass
+class TrackUpdate:
+    track_id: int
+    pose_index: int      # index into the poses passed to update()
+    fell: bool
+    state: str
+    hip_y: float | None
+
+
+class MultiFallTracker:
+    """
+    One fall detector per tracked person, all kept in fixed-size arrays
+    (slot = track). Each frame, detections are matched to tracks by hip
+    centroid, then every matched track's detector advances in one vectorized
+    step (Body.fall_states.FallStates).
+
+    Tracks unseen for `max_missed_sec` are freed; when all `max_tracks`
+    slots are taken the longest-unseen track is recycled.
+    """
+
+    def __init__(
+        self,
+        max_tracks: int = 8,
+        max_match_dist: float = 0.2,
+        max_missed_sec: float = 1.0,
+        min_visibility: float = 0.4,
+        **thresholds,
+    ):
+        unknown = set(thresholds) - set(THRESHOLDS)
+        if unknown:
+            raise AttributeError(f"Unknown FallDetector thresholds: {sorted(unknown)}")
+
+        self.max_tracks = max_tracks
+        self.max_match_dist = max_match_dist
+        self.max_missed_sec = max_missed_sec
+        self.min_visibility = min_visibility
+        self.thresholds = {**THRESHOLDS, **thresholds}
+
+        K = max_tracks
+        self.ids = np.full(K, -1, dtype=np.int64)      # -1 = free slot
+        self.centroid = np.zeros((K, 2), dtype=np.float64)
+        self.last_seen = np.full(K, np.nan)
+        self.falls = FallStates(K)
+        self._next_id = 1
+
+    def reset(self):
+        self.ids[:] = -1
+        self.last_seen[:] = np.nan
+        self.falls.reset(np.ones(self.max_tracks, dtype=bool))
+
+    @property
+    def active_tracks(self) -> int:
+        return int((self.ids >= 0).sum())
+
+    @property
+    def alerting(self) -> bool:
+        """True while any live track is past state OK."""
+        return bool(((self.ids >= 0) & (self.falls.state != 0)).any())
+
+    def _measure(self, lms: np.ndarray):
+        """(centroid xy, hip_y or NaN) for one (N, 4) pose."""
+        hips = lms[23:25]
+        if (hips[:, 3] >= self.min_visibility).all():
+            c = hips[:, :2].mean(axis=0)
+            return c, float(c[1])
+        visible = lms[:, 3] >= self.min_visibility
+        c = lms[visible, :2].mean(axis=0) if visible.any() else lms[:, :2].mean(axis=0)
+        return c, np.nan
+
+    def update(self, poses, now: float) -> list[TrackUpdate]:
+        """
+        poses: list of (N, 4) landmark arrays (full-frame normalized) for this frame.
+        Returns one TrackUpdate per pose.
+        """
+        K = self.max_tracks
+
+        # expire stale tracks
+        stale = (self.ids >= 0) & ((now - self.last_seen) > self.max_missed_sec)
+        if stale.any():
+            self.ids[stale] = -1
+            self.falls.reset(stale)
+
+        D = len(poses)
+        cents = np.zeros((D, 2))
+        hip_y = np.full(D, np.nan)
+        for i, lms in enumerate(poses):
+            cents[i], hip_y[i] = self._measure(lms)
+
+        # match to live tracks
+        live = np.flatnonzero(self.ids >= 0)
+        cost = np.linalg.norm(cents[:, None, :] - self.centroid[None, live, :], axis=2)
+        cost[cost > self.max_match_dist] = np.inf
+        slot_of = {d: int(live[k]) for d, k in _assign(cost)}
+
+        # new tracks for unmatched detections
+        for d in range(D):
+            if d in slot_of:
+                continue
+            free = np.flatnonzero(self.ids < 0)
+            taken = set(slot_of.values())
+            if len(free):
+                slot = int(free[0])
+            else:
+                # recycle the longest-unseen slot not used this frame
+                order = np.argsort(self.last_seen)
+                candidates = [int(s) for s in order if int(s) not in taken]
+                if not candidates:
+                    continue
+                slot = candidates[0]
+            self.ids[slot] = self._next_id
+            self._next_id += 1
+            self.falls.reset(np.arange(K) == slot)
+            slot_of[d] = slot
+
+        # one vectorized detector step for every matched track
+        step_now = np.full(K, np.nan)
+        step_y = np.full(K, np.nan)
+        for d, slot in slot_of.items():
+            step_now[slot] = now
+            step_y[slot] = hip_y[d]
+            self.centroid[slot] = cents[d]
+            self.last_seen[slot] = now
+        confirmed = self.falls.step(step_now, step_y, self.thresholds)
+
+        out = []
+        for d in range(D):
+            slot = slot_of.get(d)
+            if slot is None:
+                continue
+            out.append(TrackUpdate(
+                track_id=int(self.ids[slot]),
+                pose_index=d,
+                fell=bool(confirmed[slot]),
+                state=STATE_NAMES[int(self.falls.state[slot])],
+                hip_y=None if np.isnan(hip_y[d]) else float(hip_y[d]),
+            ))
+        return out
@@ -0,0 +1,130 @@
+import base64
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# ============================================================
+# Finished clip handed to the escalation path
+# ============================================================
+@dataclass
+class EventClip:
+    event_time: float                               # monotonic time of the event
+    timestamps: list = field(default_factory=list)  # monotonic capture times, oldest first
+    jpegs: list = field(default_factory=list)       # JPEG bytes per frame
+
+    def __len__(self):
+        return len(self.jpegs)
+
+    def keyframes(self, count: int = 6) -> list:
+        """`count` frames spread evenly over the clip (always includes the last one)."""
+        if not self.jpegs:
+            return []
+        idx = np.unique(np.linspace(0, len(self.jpegs) - 1, min(count, len(self.jpegs))).round().astype(int))
+        return [self.jpegs[i] for i in idx]
+
+    def keyframes_b64(self, count: int = 6) -> list:
+        """keyframes() as base64 strings, ready for a JSON alert payload."""
+        return [base64.b64encode(j).decode("ascii") for j in self.keyframes(count)]
+
+
+# ============================================================
+# Pre-event ring buffer
+# ============================================================
+class PreEventBuffer:
+    """
+    Keeps the last `seconds` of video at `fps` in a preallocated ring of
+    downscaled raw frames (longest side <= `max_side`).
+
+    push() only resizes/copies into the next slot (no encoding, no
+    allocation after the first frame). snapshot() freezes the ring and JPEG
+    encoding happens on a background worker; it returns a Future[EventClip].
+
+    Memory is fixed at seconds * fps * (max_side x max_side*aspect x 3) bytes,
+    see `nbytes`.
+    """
+
+    def __init__(self, seconds: float = 5.0, fps: float = 10.0, max_side: int = 640, jpeg_quality: int = 80):
+        self.seconds = seconds
+        self.fps = fps
+        self.max_side = max_side
+        self.jpeg_quality = jpeg_quality
+        self.capacity = max(1, int(round(seconds * fps)))
+
+        self._lock = threading.Lock()
+        self._ring: Optional[np.ndarray] = None
+        self._src_size = None    # (w, h) of incoming frames
+        self._size = None        # (w, h) of ring slots
+        self._stamps = np.zeros(self.capacity, dtype=np.float64)
+        self._count = 0          # frames ever written
+        self._last_push = None
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clip-encoder")
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self._ring is None else self._ring.nbytes
+
+    def _alloc(self, frame_shape):
+        h, w = frame_shape[:2]
+        scale = min(1.0, self.max_side / max(h, w))
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        self._ring = np.empty((self.capacity, size[1], size[0], 3), dtype=np.uint8)
+        self._size = size
+
+    def push(self, frame_bgr: np.ndarray, t: Optional[float] = None):
+        """Called from the capture loop; frames faster than `fps` are skipped."""
+        t = time.monotonic() if t is None else t
+        if self._last_push is not None and (t - self._last_push) < 1.0 / self.fps:
+            return
+        self._last_push = t
+
+        with self._lock:
+            src_size = (frame_bgr.shape[1], frame_bgr.shape[0])
+            if self._ring is None or src_size != self._src_size:
+                self._alloc(frame_bgr.shape)
+                self._src_size = src_size
+                self._count = 0
+
+            i = self._count % self.capacity
+            slot = self._ring[i]
+            if slot.shape[:2] == frame_bgr.shape[:2]:
+                np.copyto(slot, frame_bgr)
+            else:
+                cv2.resize(frame_bgr, self._size, dst=slot, interpolation=cv2.INTER_AREA)
+            self._stamps[i] = t
+            self._count += 1
+
+    def snapshot(self, event_time: Optional[float] = None) -> Future:
+        """Freezes the current ring contents and encodes them in the background."""
+        event_time = time.monotonic() if event_time is None else event_time
+        with self._lock:
+            n = min(self._count, self.capacity)
+            if n == 0:
+                frames, stamps = np.empty((0,), dtype=np.uint8), np.empty(0)
+            else:
+                order = (np.arange(self._count - n, self._count) % self.capacity)
+                frames = self._ring[order]   # fancy indexing -> copy, ring keeps running
+                stamps = self._stamps[order]
+        return self._worker.submit(self._encode, frames, stamps, event_time)
+
+    def _encode(self, frames, stamps, event_time) -> EventClip:
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), int(self.jpeg_quality)]
+        clip = EventClip(event_time=event_time)
+        for frame, t in zip(frames, stamps):
+            ok, buf = cv2.imencode(".jpg", frame, params)
+            if ok:
+                clip.timestamps.append(float(t))
+                clip.jpegs.append(buf.tobytes())
+        return clip
+
+    def clear(self):
+        with self._lock:
+            self._count = 0
+            self._last_push = None
+
+    def close(self):
+        self._worker.shutdown(wait=False)
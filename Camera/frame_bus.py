@@ -0,0 +1,205 @@
+import time
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# ============================================================
+# Frame record handed to consumers
+# ============================================================
+@dataclass
+class Frame:
+    seq: int              # monotonically increasing, starts at 1
+    timestamp: float      # time.monotonic() at capture
+    image: np.ndarray     # BGR view into the ring slot (NOT a copy)
+
+
+# ============================================================
+# Frame bus (one capture device, many consumers)
+# ============================================================
+class FrameBus:
+    """
+    Owns ONE cv2.VideoCapture and publishes frames into a preallocated
+    ring buffer. Consumers subscribe and get views into the ring, so no
+    frame is copied on the way out.
+
+    A view stays valid until the producer wraps around the ring
+    (`capacity` frames later). Consumers that hold on to a frame longer
+    than that should check `bus.is_current(frame)` or copy it.
+    """
+
+    def __init__(self, camera_index: int = 0, capacity: int = 8):
+        if capacity < 2:
+            raise ValueError("capacity must be >= 2")
+
+        self.camera_index = camera_index
+        self.capacity = capacity
+
+        self._cond = threading.Condition()
+        self._ring: Optional[np.ndarray] = None
+        self._seqs = np.zeros(capacity, dtype=np.int64)
+        self._stamps = np.zeros(capacity, dtype=np.float64)
+        self._seq = 0
+
+        self._cap: Optional[cv2.VideoCapture] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._closed = False
+
+    # ------------ lifecycle ------------
+    def start(self) -> "FrameBus":
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+
+            cap = cv2.VideoCapture(self.camera_index)
+            if not cap.isOpened():
+                cap.release()
+                raise RuntimeError("Could not open camera")
+
+            self._cap = cap
+            self._closed = False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        t = self._thread
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout=1.0)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ------------ producer ------------
+    def _capture_loop(self):
+        cap = self._cap
+        try:
+            while not self._stop.is_set():
+                idx = (self._seq + 1) % self.capacity
+
+                # read straight into the ring slot when the shape is known
+                slot = None if self._ring is None else self._ring[idx]
+                ret, frame = cap.read(slot) if slot is not None else cap.read()
+                if not ret:
+                    break
+
+                with self._cond:
+                    if self._ring is None or self._ring.shape[1:] != frame.shape:
+                        self._ring = np.empty((self.capacity,) + frame.shape, dtype=frame.dtype)
+                        self._seqs[:] = 0
+                    if frame is not slot:
+                        self._ring[idx] = frame
+
+                    self._seq += 1
+                    self._seqs[idx] = self._seq
+                    self._stamps[idx] = time.monotonic()
+                    self._cond.notify_all()
+        finally:
+            cap.release()
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+
+    # ------------ consumer side ------------
+    def _frame_at(self, idx: int) -> Frame:
+        return Frame(seq=int(self._seqs[idx]), timestamp=float(self._stamps[idx]), image=self._ring[idx])
+
+    def latest(self) -> Optional[Frame]:
+        with self._cond:
+            if self._seq == 0:
+                return None
+            return self._frame_at(self._seq % self.capacity)
+
+    def wait_newer(self, after_seq: int, timeout: Optional[float] = None) -> Optional[Frame]:
+        """
+        Blocks until a frame with seq > after_seq is published and returns
+        the NEWEST one (stale frames are skipped). None on timeout/close.
+        """
+        with self._cond:
+            ok = self._cond.wait_for(lambda: self._seq > after_seq or self._closed, timeout)
+            if not ok or self._seq <= after_seq:
+                return None
+            return self._frame_at(self._seq % self.capacity)
+
+    def is_current(self, frame: Frame) -> bool:
+        """True if the ring slot behind `frame` has not been overwritten yet."""
+        idx = frame.seq % self.capacity
+        return int(self._seqs[idx]) == frame.seq
+
+    def subscribe(self) -> "FrameSubscriber":
+        if not self.running:
+            self.start()
+        return FrameSubscriber(self)
+
+
+class FrameSubscriber:
+    """
+    Per-consumer cursor over a FrameBus. Each call hands out the newest
+    frame the consumer has not seen yet.
+
+    Also quacks like cv2.VideoCapture (read / isOpened / release) so the
+    existing capture loops can consume from the bus unchanged.
+    """
+
+    def __init__(self, bus: FrameBus, timeout: float = 1.0):
+        self.bus = bus
+        self.timeout = timeout
+        self.last_seq = 0
+        self.last_timestamp: Optional[float] = None  # capture time of the last frame handed out
+        self._released = False
+
+    def next_frame(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        if self._released:
+            return None
+        if self.last_seq == 0:
+            # start from whatever is newest right now, not from the past
+            latest = self.bus.latest()
+            if latest is not None:
+                self.last_seq = latest.seq - 1
+        frame = self.bus.wait_newer(self.last_seq, self.timeout if timeout is None else timeout)
+        if frame is not None:
+            self.last_seq = frame.seq
+            self.last_timestamp = frame.timestamp
+        return frame
+
+    # ------------ cv2.VideoCapture compatibility ------------
+    def read(self):
+        frame = self.next_frame()
+        if frame is None:
+            return False, None
+        return True, frame.image
+
+    def isOpened(self) -> bool:
+        return not self._released and self.bus.running
+
+    def release(self):
+        # the bus keeps the camera; a subscriber only drops its cursor
+        self._released = True
+
+
+# ============================================================
+# Process-wide registry (one bus per camera index)
+# ============================================================
+_buses: dict[int, FrameBus] = {}
+_buses_lock = threading.Lock()
+
+def get_frame_bus(camera_index: int = 0, capacity: int = 8) -> FrameBus:
+    """
+    Returns the shared, started FrameBus for `camera_index`, creating it
+    on first use. The camera stays open for the life of the process.
+    """
+    with _buses_lock:
+        bus = _buses.get(camera_index)
+        if bus is None:
+            bus = FrameBus(camera_index, capacity)
+            _buses[camera_index] = bus
+        if not bus.running:
+            bus.start()
+        return bus
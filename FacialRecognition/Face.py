@@ -1,34 +1,42 @@
 import cv2 
 import numpy as np
-import pickle
 import os
 import keyboard
 
+try:
+    from FacialRecognition.face_detector import FaceDetector
+    from FacialRecognition.face_cache import face_crop, load_training_crops, save_person_crops
+    from FacialRecognition.gallery_index import GalleryIndex
+    from FacialRecognition.model_store import enroll, load_index, model_lock, save_model
+    from FacialRecognition.resident_registry import get_registry
+except ImportError:
+    # run as a script from this folder
+    from face_detector import FaceDetector
+    from face_cache import face_crop, load_training_crops, save_person_crops
+    from gallery_index import GalleryIndex
+    from model_store import enroll, load_index, model_lock, save_model
+    from resident_registry import get_registry
+
 testing = True
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
 face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
 recognizer = cv2.face.LBPHFaceRecognizer_create()
-id_to_name = {}
 
-def getFace():
-    global id_to_name
-    
-    model_path = os.path.join(script_dir, 'trained_model.yml')
-    pkl_path = os.path.join(script_dir, 'id_to_name.pkl')
-    
-    if not os.path.exists(model_path):
+def getFace(frame_bus=None):
+    # binary artifact, memory-mapped: no parsing per call
+    index = load_index(script_dir)
+    if index is None:
         return None
     
-    recognizer.read(model_path)
-    
-    if os.path.exists(pkl_path):
-        with open(pkl_path, 'rb') as f:
-            id_to_name = pickle.load(f)
+    # label -> ID lookups go to the registry (indexed, safe while enrollment writes)
+    id_to_name = get_registry(script_dir).names
     
-    cap = cv2.VideoCapture(0)
+    # frame_bus: optional Camera.frame_bus.FrameBus shared with the other modules
+    cap = frame_bus.subscribe() if frame_bus is not None else cv2.VideoCapture(0)
     
+    detector = FaceDetector(face_cascade)
     detected_id = None
     start_time = cv2.getTickCount()
     timeout = 0.5
@@ -44,14 +52,14 @@ def getFace():
             break
         
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+        faces = detector.detect(gray)
         
         if len(faces) > 0:
             x, y, w, h = faces[0]
             face_roi = gray[y:y+h, x:x+w]
             face_roi = cv2.resize(face_roi, (200, 200))
             
-            predicted_id, confidence = recognizer.predict(face_roi)
+            predicted_id, confidence = index.predict(face_roi)
             
             if confidence < 50:
                 detected_id = id_to_name.get(predicted_id)
@@ -74,44 +82,31 @@ def generate_unique_id():
     
     while True:
         unique_id = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        if unique_id not in existing_ids:
+        if unique_id not in existing_ids and unique_id not in get_registry(script_dir):
             return unique_id
 
-def save_registry(person_id, note=""):
-    registry_file = os.path.join(script_dir, 'registry.txt')
-    
-    with open(registry_file, 'a') as f:
-        timestamp = cv2.getTickCount()
-        f.write(f"{person_id}|{note}|{timestamp}\n")
+def save_registry(person_id, note="", photo_count=0):
+    registry = get_registry(script_dir)
+    registry.add(person_id, note, photo_count)
     
-    print(f"ID saved to {registry_file}")
+    print(f"ID saved to {registry.path}")
 
 def view_registry():
-    registry_file = os.path.join(script_dir, 'registry.txt')
-    
-    if not os.path.exists(registry_file):
-        print("No registry file found. No people registered yet.")
-        return
+    residents = get_registry(script_dir).residents()
     
     print("\n" + "="*60)
     print("REGISTERED PEOPLE")
     print("="*60)
     
-    with open(registry_file, 'r') as f:
-        lines = f.readlines()
-        
-    if not lines:
+    if not residents:
         print("No people registered yet.")
         return
     
-    for i, line in enumerate(lines, 1):
-        parts = line.strip().split('|')
-        person_id = parts[0]
-        note = parts[1] if len(parts) > 1 else ""
-        
-        print(f"{i}. ID: {person_id}")
-        if note:
-            print(f"   Note: {note}")
+    for i, r in enumerate(residents, 1):
+        enrolled = f"label {r.label}" if r.label is not None else "not enrolled"
+        print(f"{i}. ID: {r.person_id} ({enrolled}, {r.photo_count} photos)")
+        if r.note:
+            print(f"   Note: {r.note}")
         print()
 
 def capture_training_data():
@@ -126,6 +121,7 @@ def capture_training_data():
     os.makedirs(person_dir)
     
     cap = cv2.VideoCapture(0)
+    detector = FaceDetector(face_cascade)
     
     print(f"\n{'='*50}")
     print(f"Assigned ID: {unique_id}")
@@ -135,6 +131,8 @@ def capture_training_data():
     
     count = 0
     max_photos = 30
+    # only the 200x200 face crop is kept, packed into training_data/<id>/crops.npy
+    crops = []
     
     while count < max_photos:
         ret, img = cap.read()
@@ -143,7 +141,7 @@ def capture_training_data():
             break
         
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+        faces = detector.detect(gray)
         
         display_img = img.copy()
         
@@ -160,9 +158,13 @@ def capture_training_data():
         key = cv2.waitKey(1) & 0xFF
         
         if key == ord(' '):
-            if len(faces) > 0:
-                photo_path = os.path.join(person_dir, f'photo_{count}.jpg')
-                cv2.imwrite(photo_path, img)
+            # the downscaled/tracked boxes are for the preview only: the saved
+            # crop comes from the same full-resolution detection as
+            # face_cache.extract_face_crops, so both frame faces alike
+            still = face_cascade.detectMultiScale(gray, 1.3, 5)
+            if len(still) > 0:
+                largest = max(still, key=lambda f: f[2] * f[3])
+                crops.append(face_crop(gray, largest))
                 count += 1
                 print(f"Captured photo {count}/{max_photos}")
             else:
@@ -179,19 +181,41 @@ def capture_training_data():
         os.rmdir(person_dir)
         return None
     
+    save_person_crops(person_dir, np.stack(crops))
+    
     print(f"\n{'='*50}")
     print(f"Successfully captured {count} photos!")
     print(f"Person ID: {unique_id}")
     print(f"{'='*50}")
     
-    save_registry(unique_id)
+    save_registry(unique_id, photo_count=count)
+    enroll_person(unique_id)
     
     return unique_id
 
+def enroll_person(person_id):
+    """
+    Adds one person's face crops to the existing model instead of
+    retraining everyone; the model file is swapped in atomically so
+    running recognizers pick the new person up on their next reload.
+    """
+    training_dir = os.path.join(script_dir, 'training_data')
+    people, stats = load_training_crops(training_dir, os.path.join(script_dir, 'crop_cache'),
+                                        people=[person_id])
+    if not people or len(people[0][1]) == 0:
+        print(f"No faces found for {person_id}; not enrolled.")
+        return None
+    
+    crops = people[0][1]
+    # already in training_data/<id>/crops.npy, so not written again
+    label = enroll(script_dir, person_id, crops, persist=False)
+    print(f"Enrolled {person_id} (ID: {label}) with {len(crops)} face samples "
+          f"({stats['seconds']:.2f}s)")
+    return label
+
 def train_recognizer():
     faces = []
     labels = []
-    current_id = 0
     
     training_dir = os.path.join(script_dir, 'training_data')
     
@@ -199,74 +223,47 @@ def train_recognizer():
         print(f"No training data found! Run capture_training_data() first.")
         return False
     
-    for person_name in os.listdir(training_dir):
-        person_path = os.path.join(training_dir, person_name)
-        
-        if not os.path.isdir(person_path):
-            continue
-            
-        id_to_name[current_id] = person_name
+    # packed crops.npy per person, memory-mapped; folders that still hold
+    # photos are migrated to crops.npy once (decoded + detected in a process pool)
+    people, stats = load_training_crops(training_dir, os.path.join(script_dir, 'crop_cache'))
+    print(f"Face crops: {stats['packed']} people packed, {stats['migrated']} migrated from "
+          f"{stats['photos']} photos ({stats['seconds']:.2f}s)")
+    
+    # labels come from the registry, so they stay the same across retrains
+    registry = get_registry(script_dir)
+    for person_name, crops in people:
+        current_id = registry.assign_label(person_name)
         print(f"Training on {person_name} (ID: {current_id})...")
-        
-        for image_name in os.listdir(person_path):
-            if not image_name.endswith('.jpg'):
-                continue
-                
-            image_path = os.path.join(person_path, image_name)
-            
-            img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-            
-            if img is None:
-                continue
-            
-            detected_faces = face_cascade.detectMultiScale(img, 1.3, 5)
-            
-            for (x, y, w, h) in detected_faces:
-                face_roi = img[y:y+h, x:x+w]
-                face_roi = cv2.resize(face_roi, (200, 200))
-                faces.append(face_roi)
-                labels.append(current_id)
-        
-        current_id += 1
+        faces.extend(crops)
+        labels.extend([current_id] * len(crops))
     
     if len(faces) == 0:
         print("No faces found in training data!")
         return False
     
     print(f"Training with {len(faces)} face samples...")
-    recognizer.train(faces, np.array(labels))
-    
-    model_path = os.path.join(script_dir, 'trained_model.yml')
-    recognizer.save(model_path)
-    
-    pkl_path = os.path.join(script_dir, 'id_to_name.pkl')
-    with open(pkl_path, 'wb') as f:
-        pickle.dump(id_to_name, f)
+    with model_lock(script_dir):
+        recognizer.train(faces, np.array(labels))
+        save_model(script_dir, GalleryIndex.from_recognizer(recognizer))
+    registry.mark_enrolled([person_name for person_name, crops in people if len(crops)])
     
     print("Training complete!")
     print("You can now run recognize_faces()")
     return True
 
 def recognize_faces():
-    global id_to_name
-    
-    model_path = os.path.join(script_dir, 'trained_model.yml')
-    pkl_path = os.path.join(script_dir, 'id_to_name.pkl')
-    
-    if not os.path.exists(model_path):
+    index = load_index(script_dir)
+    if index is None:
         print("No trained model found!")
         print("\nPlease run these steps first:")
         print("1. capture_training_data() - to capture photos")
         print("2. train_recognizer() - to train the model")
         return
     
-    recognizer.read(model_path)
-    
-    if os.path.exists(pkl_path):
-        with open(pkl_path, 'rb') as f:
-            id_to_name = pickle.load(f)
+    id_to_name = get_registry(script_dir).names
     
     cap = cv2.VideoCapture(0)
+    detector = FaceDetector(face_cascade)
     
     print("Press 'q' to quit")
     
@@ -278,7 +275,7 @@ def recognize_faces():
         
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         
-        faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+        faces = detector.detect(gray)
         
         if len(faces) == 0:
             cv2.putText(img, "No face detected", (10, 30), 
@@ -288,7 +285,7 @@ def recognize_faces():
                 face_roi = gray[y:y+h, x:x+w]
                 face_roi = cv2.resize(face_roi, (200, 200))
                 
-                predicted_id, confidence = recognizer.predict(face_roi)
+                predicted_id, confidence = index.predict(face_roi)
                 
                 if confidence < 50:
                     name = id_to_name.get(predicted_id, "Unknown")
@@ -319,7 +316,7 @@ while __name__ == "__main__" and testing:
     print("=" * 50)
     print("\nAvailable functions:")
     print("1. capture_training_data() - Capture photos from webcam")
-    print("2. train_recognizer() - Train the model with captured photos")
+    print("2. train_recognizer() - Retrain the model on all captured photos")
     print("3. recognize_faces() - Run face recognition")
     print("4. getFace() - Return the userID")
     print("q. Quit")
@@ -0,0 +1,255 @@
+"""
+Face-crop training set.
+
+capture_training_data stores each person's 200x200 grayscale face crops in
+one packed array, training_data/<person>/crops.npy (k, 200, 200) uint8,
+which training memory-maps: no JPEG decoding, no face detection.
+
+Older person folders hold full camera photos (photo_*.jpg). They are
+migrated once, the first time they are loaded: every photo is turned into
+its crops (cached per photo in crop_cache/<person>.npz, keyed by file name
++ mtime + size, in a process pool) and written as crops.npy. Once a folder
+has crops.npy, its photos are no longer read.
+
+    python -m FacialRecognition.face_cache [training_dir] [--remove-photos]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+CROP_SIZE = (200, 200)
+CROPS_FILE = "crops.npy"
+
+# below this many photos to extract, pool start-up costs more than it saves
+MIN_PARALLEL = 8
+
+
+# ============================================================
+# Extraction (runs in worker processes)
+# ============================================================
+_cascade = None
+
+
+def extract_face_crops(image_path: str) -> np.ndarray:
+    """(k, 200, 200) uint8 crops of every face in one photo; k may be 0."""
+    global _cascade
+    if _cascade is None:
+        _cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+
+    img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return np.empty((0, *CROP_SIZE), dtype=np.uint8)
+
+    # full resolution on purpose: training crops are worth the extra time
+    faces = _cascade.detectMultiScale(img, 1.3, 5)
+    crops = np.empty((len(faces), *CROP_SIZE), dtype=np.uint8)
+    for i, (x, y, w, h) in enumerate(faces):
+        crops[i] = cv2.resize(img[y:y+h, x:x+w], CROP_SIZE)
+    return crops
+
+
+# ============================================================
+# Per-person cache files
+# ============================================================
+def _photo_key(path: str):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_person_cache(cache_path: str) -> dict:
+    """file name -> (mtime_ns, size, crops)"""
+    if not os.path.exists(cache_path):
+        return {}
+    try:
+        with np.load(cache_path) as z:
+            names, mtimes, sizes, counts, crops = z["names"], z["mtimes"], z["sizes"], z["counts"], z["crops"]
+    except (OSError, KeyError, ValueError):
+        return {}  # unreadable cache -> rebuild this person
+
+    out, offset = {}, 0
+    for name, mtime, size, count in zip(names.tolist(), mtimes.tolist(), sizes.tolist(), counts.tolist()):
+        out[name] = (mtime, size, crops[offset:offset + count])
+        offset += count
+    return out
+
+
+def _save_person_cache(cache_path: str, entries: dict):
+    names = sorted(entries)
+    crops = [entries[n][2] for n in names]
+    tmp = cache_path + ".tmp.npz"
+    np.savez(
+        tmp,
+        names=np.array(names, dtype=str),
+        mtimes=np.array([entries[n][0] for n in names], dtype=np.int64),
+        sizes=np.array([entries[n][1] for n in names], dtype=np.int64),
+        counts=np.array([len(c) for c in crops], dtype=np.int32),
+        crops=np.concatenate(crops) if crops else np.empty((0, *CROP_SIZE), dtype=np.uint8),
+    )
+    os.replace(tmp, cache_path)
+
+
+# ============================================================
+# Packed per-person crops
+# ============================================================
+def crops_path(person_dir: str) -> str:
+    return os.path.join(person_dir, CROPS_FILE)
+
+
+def load_person_crops(person_dir: str, mmap: bool = True):
+    """(k, 200, 200) uint8 from crops.npy (memory-mapped), or None if the folder is not packed."""
+    path = crops_path(person_dir)
+    if not os.path.exists(path):
+        return None
+    crops = np.load(path, mmap_mode="r" if mmap else None)
+    if crops.dtype != np.uint8 or crops.shape[1:] != CROP_SIZE:
+        raise ValueError(f"{path}: expected (k, 200, 200) uint8, got {crops.shape} {crops.dtype}")
+    return crops
+
+
+def save_person_crops(person_dir: str, crops: np.ndarray, append: bool = False):
+    """Writes crops.npy atomically; append=True keeps the crops already there."""
+    crops = np.asarray(crops, dtype=np.uint8).reshape(-1, *CROP_SIZE)
+    if append:
+        old = load_person_crops(person_dir, mmap=False)
+        if old is not None:
+            crops = np.concatenate([old, crops])
+    path = crops_path(person_dir)
+    tmp = path + ".tmp.npy"
+    np.save(tmp, crops)
+    os.replace(tmp, path)
+    return len(crops)
+
+
+def face_crop(gray: np.ndarray, box) -> np.ndarray:
+    """The 200x200 crop training and recognition use for one detected face box."""
+    x, y, w, h = box
+    return cv2.resize(gray[y:y+h, x:x+w], CROP_SIZE)
+
+
+# ============================================================
+# Training set
+# ============================================================
+def load_training_crops(training_dir: str, cache_dir: str, processes: int | None = None, people=None):
+    """
+    Returns ([(person_id, crops (k, 200, 200) uint8), ...] sorted by person,
+    stats dict with packed / migrated / photos / extracted / cached / seconds).
+    `people` restricts it to those person folders (e.g. one new enrollment).
+
+    Packed folders are memory-mapped; photo folders are migrated to
+    crops.npy on the way (their crop cache entry is then dropped).
+    """
+    start = time.perf_counter()
+
+    if people is None:
+        people = os.listdir(training_dir)
+    people = sorted(
+        p for p in people if os.path.isdir(os.path.join(training_dir, p))
+    )
+
+    packed = {}
+    for person in people:
+        crops = load_person_crops(os.path.join(training_dir, person))
+        if crops is not None:
+            packed[person] = crops
+    legacy, stats = _extract_photo_crops(training_dir, cache_dir, [p for p in people if p not in packed], processes)
+
+    # one-time migration: photos -> crops.npy (folders without a face stay as they are)
+    migrated = 0
+    for person, crops in legacy.items():
+        if len(crops) == 0:
+            continue
+        save_person_crops(os.path.join(training_dir, person), crops)
+        migrated += 1
+        try:
+            os.remove(os.path.join(cache_dir, person + ".npz"))
+        except OSError:
+            pass
+
+    out = [(person, packed[person] if person in packed else legacy[person]) for person in people]
+    stats.update(packed=len(packed), migrated=migrated, seconds=time.perf_counter() - start)
+    return out, stats
+
+
+def _extract_photo_crops(training_dir: str, cache_dir: str, people, processes: int | None = None):
+    """{person: crops} from photo_*.jpg folders through the per-photo crop cache."""
+    if not people:
+        return {}, {"photos": 0, "extracted": 0, "cached": 0}
+    os.makedirs(cache_dir, exist_ok=True)
+
+    caches, wanted, stale = {}, {}, []
+    for person in people:
+        person_dir = os.path.join(training_dir, person)
+        cache = _load_person_cache(os.path.join(cache_dir, person + ".npz"))
+        caches[person] = cache
+        wanted[person] = {}
+        for name in sorted(os.listdir(person_dir)):
+            if not name.endswith(".jpg"):
+                continue
+            key = _photo_key(os.path.join(person_dir, name))
+            wanted[person][name] = key
+            hit = cache.get(name)
+            if hit is None or (hit[0], hit[1]) != key:
+                stale.append((person, name))
+
+    # decode + detect only new / changed photos, in parallel when worth it
+    paths = [os.path.join(training_dir, person, name) for person, name in stale]
+    if len(paths) >= MIN_PARALLEL and (processes is None or processes > 1):
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(extract_face_crops, paths, chunksize=4))
+    else:
+        results = [extract_face_crops(p) for p in paths]
+
+    fresh = {}
+    for (person, name), crops in zip(stale, results):
+        fresh.setdefault(person, {})[name] = crops
+
+    out = {}
+    for person in people:
+        cache = caches[person]
+        entries = {}
+        for name, (mtime, size) in wanted[person].items():
+            crops = fresh.get(person, {}).get(name)
+            if crops is None:
+                crops = cache[name][2]
+            entries[name] = (mtime, size, crops)
+        # rewrite only when something was added, changed or deleted
+        if person in fresh or set(cache) != set(entries):
+            _save_person_cache(os.path.join(cache_dir, person + ".npz"), entries)
+        crops = [e[2] for e in entries.values() if len(e[2])]
+        out[person] = np.concatenate(crops) if crops else np.empty((0, *CROP_SIZE), dtype=np.uint8)
+
+    stats = {
+        "photos": sum(len(w) for w in wanted.values()),
+        "extracted": len(stale),
+        "cached": sum(len(w) for w in wanted.values()) - len(stale),
+    }
+    return out, stats
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Pack training_data/<person>/photo_*.jpg into crops.npy")
+    here = os.path.dirname(os.path.abspath(__file__))
+    ap.add_argument("training_dir", nargs="?", default=os.path.join(here, "training_data"))
+    ap.add_argument("--cache-dir", default=os.path.join(here, "crop_cache"))
+    ap.add_argument("--remove-photos", action="store_true", help="delete the JPEGs once packed")
+    args = ap.parse_args()
+
+    people, stats = load_training_crops(args.training_dir, args.cache_dir)
+    for person, crops in people:
+        print(f"{person}: {len(crops)} crops")
+        if args.remove_photos:
+            person_dir = os.path.join(args.training_dir, person)
+            packed = load_person_crops(person_dir)
+            if packed is None or len(packed) == 0:
+                # nothing usable was packed (no face found): the photos are all there is
+                print(f"{person}: no crops.npy written, photos kept")
+                continue
+            for name in os.listdir(person_dir):
+                if name.endswith(".jpg"):
+                    os.remove(os.path.join(person_dir, name))
+    print(f"{stats['migrated']} folders migrated ({stats['photos']} photos), "
+          f"{stats['packed']} already packed, {stats['seconds']:.2f}s")
@@ -0,0 +1,129 @@
+import cv2
+import numpy as np
+
+
+def load_face_cascade():
+    return cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+
+
+# ============================================================
+# Downscaled + tracked Haar face detection
+# ============================================================
+class FaceDetector:
+    """
+    Haar face detection shared by Face.py and Perception.check_status.
+
+    Full detections run on a copy of the gray frame downscaled to
+    `detect_width` (so the smallest face found is the 24 px cascade window
+    at that scale, 48 px in a 640-wide frame). Like the original full-frame
+    detectMultiScale there is no other size bound by default; `min_face` /
+    `max_face` (fractions of the frame's shorter side, e.g. 0.12 / 0.9) opt
+    in to a tighter range when the camera distance is known. Boxes are
+    mapped back to full-resolution coordinates.
+
+    Between full detections (every `redetect_every` frames) each known face
+    is only looked for inside its last box grown by `track_margin`, scaled
+    so the face is about `track_face_px` wide and searched over a narrow
+    size range. A face lost in its window triggers a full detection.
+
+    detect() returns an (N, 4) int array of x, y, w, h like detectMultiScale.
+    """
+
+    def __init__(
+        self,
+        cascade=None,
+        detect_width: int = 320,
+        scale_factor: float = 1.3,
+        min_neighbors: int = 5,
+        min_face: float | None = None,
+        max_face: float | None = None,
+        redetect_every: int = 10,
+        track_margin: float = 0.5,
+        track_face_px: int = 80,
+    ):
+        self.cascade = cascade if cascade is not None else load_face_cascade()
+        self.detect_width = detect_width
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_face = min_face
+        self.max_face = max_face
+        self.redetect_every = redetect_every
+        self.track_margin = track_margin
+        self.track_face_px = track_face_px
+
+        self.full_detections = 0
+        self.tracked_detections = 0
+        self.reset()
+
+    def reset(self):
+        self._boxes = np.empty((0, 4), dtype=np.int32)
+        self._since_full = 0
+
+    def detect_full(self, gray: np.ndarray) -> np.ndarray:
+        """Downscaled detection over the whole frame (no tracking state used)."""
+        h, w = gray.shape[:2]
+        scale = min(1.0, self.detect_width / float(w))
+        small = gray if scale == 1.0 else cv2.resize(
+            gray, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA
+        )
+
+        short = min(small.shape[:2])
+        min_side = max(24, int(short * (self.min_face or 0.0)))   # 24 = cascade window
+        bounds = {}
+        if self.min_face is not None:
+            bounds["minSize"] = (min_side, min_side)
+        if self.max_face is not None:
+            max_side = max(min_side + 1, int(short * self.max_face))
+            bounds["maxSize"] = (max_side, max_side)
+        faces = self.cascade.detectMultiScale(small, self.scale_factor, self.min_neighbors, **bounds)
+        self.full_detections += 1
+        if len(faces) == 0:
+            return np.empty((0, 4), dtype=np.int32)
+        return np.round(np.asarray(faces, dtype=np.float32) / scale).astype(np.int32)
+
+    def _track_one(self, gray: np.ndarray, box) -> np.ndarray | None:
+        H, W = gray.shape[:2]
+        x, y, w, h = (int(v) for v in box)
+        m = int(max(w, h) * self.track_margin)
+        x0, y0 = max(0, x - m), max(0, y - m)
+        x1, y1 = min(W, x + w + m), min(H, y + h + m)
+        if x1 - x0 < 24 or y1 - y0 < 24:
+            return None
+
+        window = gray[y0:y1, x0:x1]
+        scale = min(1.0, self.track_face_px / float(max(w, 1)))
+        if scale < 1.0:
+            window = cv2.resize(
+                window, (max(1, int(window.shape[1] * scale)), max(1, int(window.shape[0] * scale))),
+                interpolation=cv2.INTER_AREA,
+            )
+        side = w * scale
+        min_side = max(24, int(side * 0.7))
+        max_side = max(min_side + 1, int(side * 1.4))
+        found = self.cascade.detectMultiScale(
+            window, 1.1, self.min_neighbors,
+            minSize=(min_side, min_side), maxSize=(max_side, max_side),
+        )
+        self.tracked_detections += 1
+        if len(found) == 0:
+            return None
+
+        # closest to the previous box centre
+        f = np.asarray(found, dtype=np.float32) / scale
+        centres = f[:, :2] + f[:, 2:] / 2.0
+        prev = np.array([x - x0 + w / 2.0, y - y0 + h / 2.0], dtype=np.float32)
+        bx, by, bw, bh = f[int(np.argmin(((centres - prev) ** 2).sum(axis=1)))]
+        return np.array([bx + x0, by + y0, bw, bh]).round().astype(np.int32)
+
+    def detect(self, gray: np.ndarray) -> np.ndarray:
+        """Faces in a grayscale frame of a continuous stream (uses tracking)."""
+        if len(self._boxes) and self._since_full < self.redetect_every:
+            tracked = [self._track_one(gray, b) for b in self._boxes]
+            if all(t is not None for t in tracked):
+                self._since_full += 1
+                self._boxes = np.stack(tracked)
+                return self._boxes
+
+        self._boxes = self.detect_full(gray)
+        self._since_full = 0
+        return self._boxes
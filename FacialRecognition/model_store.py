@@ -0,0 +1,217 @@
+"""
+Writing the face model (trained_model.lbph, a GalleryIndex artifact) safely
+while recognizers are running. Labels live in the resident registry
+(resident_registry.py).
+
+- model_lock(): one writer at a time across processes (lock file, so it
+  also works on Windows)
+- the model is written to a temp name and swapped in with os.replace(), so
+  a reader sees either the old or the new file, never a partial one
+- a label is committed to the registry before the model that uses it: a
+  reader that briefly pairs it with the old model only sees an unused label
+- enroll() never rewrites the model: each enrollment's samples go to a
+  small trained_model.enroll-NNNN.lbph segment next to it, joined on at
+  load, so enrolling costs the same with 5 residents or 500. Every
+  MAX_SEGMENTS enrollments (and on every full retrain) the segments are
+  merged back into trained_model.lbph
+
+trained_model.yml (OpenCV's YAML) is only read for models trained before
+the binary artifact existed; convert one once with
+
+    python -m FacialRecognition.model_store [face_dir]
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+try:
+    from FacialRecognition.face_cache import save_person_crops
+    from FacialRecognition.gallery_index import GalleryIndex, read_header
+    from FacialRecognition.resident_registry import get_registry
+except ImportError:
+    # run as a script from this folder
+    from face_cache import save_person_crops
+    from gallery_index import GalleryIndex, read_header
+    from resident_registry import get_registry
+
+MODEL_FILE = "trained_model.lbph"
+LEGACY_MODEL_FILE = "trained_model.yml"
+LOCK_FILE = "trained_model.lock"
+SEGMENT_PREFIX = "trained_model.enroll-"
+SEGMENT_SUFFIX = ".lbph"
+MAX_SEGMENTS = 32
+
+
+def _file_sig(path: str):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _segments(model_dir: str) -> list:
+    """Enrollment segment paths, oldest first."""
+    try:
+        names = os.listdir(model_dir)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(model_dir, n) for n in sorted(names)
+            if n.startswith(SEGMENT_PREFIX) and n.endswith(SEGMENT_SUFFIX)]
+
+
+def model_signature(model_dir: str):
+    """Changes whenever the model on disk changes (for hot reload)."""
+    files = [os.path.join(model_dir, f) for f in (MODEL_FILE, LEGACY_MODEL_FILE)] + _segments(model_dir)
+    return tuple((os.path.basename(p), _file_sig(p)) for p in files)
+
+
+def has_model(model_dir: str) -> bool:
+    """True if model_dir holds a face model (artifact, legacy YAML or enrollment segments)."""
+    return any(sig is not None for _, sig in model_signature(model_dir))
+
+
+@contextmanager
+def model_lock(model_dir: str, timeout: float = 30.0, stale_after: float = 300.0):
+    path = os.path.join(model_dir, LOCK_FILE)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > stale_after:
+                    os.remove(path)  # left behind by a crashed writer
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Model is locked by another writer: {path}")
+            time.sleep(0.05)
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def convert_yaml(yml_path: str, out_path: str) -> GalleryIndex:
+    """OpenCV LBPH YAML -> binary artifact (written atomically)."""
+    lbph = cv2.face.LBPHFaceRecognizer_create()
+    lbph.read(yml_path)
+    index = GalleryIndex.from_recognizer(lbph)
+    tmp = out_path + ".tmp"
+    index.save(tmp)
+    os.replace(tmp, out_path)
+    return index
+
+
+def load_index(model_dir: str):
+    """
+    GalleryIndex from the artifact (else from a legacy YAML model) plus any
+    enrollment segments, or None if there is no model at all.
+    """
+    parts = []
+    path = os.path.join(model_dir, MODEL_FILE)
+    legacy = os.path.join(model_dir, LEGACY_MODEL_FILE)
+    if os.path.exists(path):
+        parts.append(GalleryIndex.load(path))
+    elif os.path.exists(legacy):
+        lbph = cv2.face.LBPHFaceRecognizer_create()
+        lbph.read(legacy)
+        parts.append(GalleryIndex.from_recognizer(lbph))
+    for seg in _segments(model_dir):
+        try:
+            parts.append(GalleryIndex.load(seg, mmap=False))
+        except FileNotFoundError:
+            pass  # merged and removed since it was listed; the new model holds it
+    return GalleryIndex.concat(parts) if parts else None
+
+
+def save_model(model_dir: str, index: GalleryIndex):
+    """
+    Atomically replaces the model; `index` must hold every sample, as the
+    enrollment segments are removed afterwards. A reader in between sees
+    those samples twice, which changes no nearest-neighbour result.
+    """
+    model_path = os.path.join(model_dir, MODEL_FILE)
+    tmp = model_path + ".tmp"
+    index.save(tmp)
+    os.replace(tmp, model_path)
+    for seg in _segments(model_dir):
+        os.remove(seg)
+
+
+def _write_segment(model_dir: str, index: GalleryIndex):
+    segments = _segments(model_dir)
+    last = int(os.path.basename(segments[-1])[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) if segments else 0
+    path = os.path.join(model_dir, f"{SEGMENT_PREFIX}{last + 1:04d}{SEGMENT_SUFFIX}")
+    tmp = path + ".tmp"
+    index.save(tmp)
+    os.replace(tmp, path)
+
+
+def enroll(model_dir: str, person_id: str, crops: np.ndarray, persist: bool = True) -> int:
+    """
+    Adds one person's (k, 200, 200) crops to the existing model (only the
+    new samples' histograms are computed, and only they are written, as a
+    segment) and returns their label. A person who already has a label
+    keeps it and gets the new samples added. Creates the model if there is
+    none yet.
+
+    persist=True also appends the crops to training_data/<person_id>/crops.npy,
+    so a later full retrain keeps them; pass False when they were read from
+    there in the first place.
+    """
+    if len(crops) == 0:
+        raise ValueError(f"No face samples for {person_id}")
+
+    with model_lock(model_dir):
+        # the new samples need the model's LBP parameters, not its samples
+        path = os.path.join(model_dir, MODEL_FILE)
+        legacy = os.path.join(model_dir, LEGACY_MODEL_FILE)
+        if not os.path.exists(path) and os.path.exists(legacy):
+            convert_yaml(legacy, path)   # once; segments are only joined onto the artifact
+        if os.path.exists(path):
+            params = read_header(path)
+            del params["n"], params["dim"]
+        else:
+            params = {}                  # default LBPH parameters
+        segment = GalleryIndex(np.empty(0, np.float32), [], **params)
+
+        # committed before the segment is written; atomic in the registry itself
+        registry = get_registry(model_dir)
+        label = registry.assign_label(person_id)
+
+        if persist:
+            # before the model swap: a crash in between leaves crops a retrain picks up
+            person_dir = os.path.join(model_dir, "training_data", person_id)
+            os.makedirs(person_dir, exist_ok=True)
+            save_person_crops(person_dir, crops, append=True)
+        segment.add(crops, label)
+        if len(_segments(model_dir)) >= MAX_SEGMENTS:
+            # merge everything back into one artifact (the only O(model) enrollment)
+            save_model(model_dir, GalleryIndex.concat([load_index(model_dir), segment]))
+        else:
+            _write_segment(model_dir, segment)
+        registry.mark_enrolled([person_id])
+    return label
+
+
+if __name__ == "__main__":
+    face_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    yml = os.path.join(face_dir, LEGACY_MODEL_FILE)
+    out = os.path.join(face_dir, MODEL_FILE)
+    t0 = time.perf_counter()
+    index = convert_yaml(yml, out)
+    print(f"{yml} ({os.path.getsize(yml) / 1e6:.1f} MB) -> {out} ({os.path.getsize(out) / 1e6:.1f} MB), "
+          f"{len(index)} samples, {time.perf_counter() - t0:.1f}s")
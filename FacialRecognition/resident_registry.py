@@ -0,0 +1,239 @@
+"""
+Resident registry: one SQLite database (registry.db, WAL mode) holding each
+resident's ID, model label, note, capture / enrollment times and photo
+count. Replaces registry.txt and id_to_name.pkl.
+
+- person_id is the primary key and label has a unique index, so both
+  lookups are O(log n)
+- WAL lets recognizers keep reading while enrollment writes; every thread
+  gets its own connection
+- labels are assigned in an IMMEDIATE transaction, so concurrent
+  enrollments (other processes included) never get the same label
+
+    registry = get_registry(face_dir)
+    registry.add("S10E88", note="room 4", photo_count=30)
+    label = registry.assign_label("S10E88")
+    registry.names.get(label)   -> "S10E88"  (what recognizers use)
+
+On first use an existing registry.txt / id_to_name.pkl is imported once.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    from FacialRecognition.face_cache import load_person_crops
+except ImportError:
+    # run as a script from this folder
+    from face_cache import load_person_crops
+
+DB_FILE = "registry.db"
+LEGACY_REGISTRY_FILE = "registry.txt"
+LEGACY_LABELS_FILE = "id_to_name.pkl"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS residents (
+    person_id   TEXT PRIMARY KEY,
+    label       INTEGER UNIQUE,              -- model label, NULL until enrolled
+    note        TEXT NOT NULL DEFAULT '',
+    created_at  REAL,                        -- unix time of capture (NULL if imported)
+    enrolled_at REAL,                        -- unix time of last enrollment / training
+    photo_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True)
+class Resident:
+    person_id: str
+    label: Optional[int]
+    note: str
+    created_at: Optional[float]
+    enrolled_at: Optional[float]
+    photo_count: int
+
+
+class LabelNames:
+    """Read-only label -> person_id view; a dict stand-in for recognizers (get / [] / in)."""
+
+    def __init__(self, registry: "ResidentRegistry"):
+        self._registry = registry
+
+    def get(self, label, default=None):
+        name = self._registry.name_for(label)
+        return default if name is None else name
+
+    def __getitem__(self, label):
+        name = self._registry.name_for(label)
+        if name is None:
+            raise KeyError(label)
+        return name
+
+    def __contains__(self, label) -> bool:
+        return self._registry.name_for(label) is not None
+
+    def __len__(self) -> int:
+        return len(self._registry.labels())
+
+
+class ResidentRegistry:
+    def __init__(self, face_dir: str = "."):
+        self.face_dir = face_dir
+        self.path = os.path.join(face_dir, DB_FILE)
+        self.names = LabelNames(self)
+        self._local = threading.local()
+
+        os.makedirs(face_dir, exist_ok=True)
+        created = not os.path.exists(self.path)
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+        if created:
+            self._import_legacy()
+
+    # ---------------- connections ----------------
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Closes this thread's connection (others close with their threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ---------------- reads ----------------
+    def name_for(self, label) -> Optional[str]:
+        if label is None:
+            return None
+        row = self._conn().execute("SELECT person_id FROM residents WHERE label = ?", (int(label),)).fetchone()
+        return row[0] if row else None
+
+    def label_for(self, person_id: str) -> Optional[int]:
+        row = self._conn().execute("SELECT label FROM residents WHERE person_id = ?", (person_id,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, person_id: str) -> Optional[Resident]:
+        row = self._conn().execute("SELECT * FROM residents WHERE person_id = ?", (person_id,)).fetchone()
+        return Resident(*row) if row else None
+
+    def __contains__(self, person_id: str) -> bool:
+        return self.get(person_id) is not None
+
+    def residents(self) -> list:
+        rows = self._conn().execute(
+            "SELECT * FROM residents ORDER BY created_at IS NULL DESC, created_at, person_id"
+        ).fetchall()
+        return [Resident(*r) for r in rows]
+
+    def labels(self) -> dict:
+        """label -> person_id for every enrolled resident (the old id_to_name)."""
+        rows = self._conn().execute("SELECT label, person_id FROM residents WHERE label IS NOT NULL")
+        return dict(rows.fetchall())
+
+    # ---------------- writes ----------------
+    def add(self, person_id: str, note: str = "", photo_count: int = 0, created_at: Optional[float] = None):
+        """Registers a resident (or updates note / photo count of an existing one)."""
+        created_at = time.time() if created_at is None else created_at
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO residents (person_id, note, created_at, photo_count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(person_id) DO UPDATE SET note = excluded.note, photo_count = excluded.photo_count",
+                (person_id, note, created_at, photo_count),
+            )
+
+    def assign_label(self, person_id: str) -> int:
+        """The resident's label, assigning the next free one (and registering them) if needed."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")   # write lock first: no two callers read the same max
+        try:
+            row = conn.execute("SELECT label FROM residents WHERE person_id = ?", (person_id,)).fetchone()
+            if row is not None and row[0] is not None:
+                conn.execute("COMMIT")
+                return row[0]
+            label = conn.execute("SELECT COALESCE(MAX(label), -1) + 1 FROM residents").fetchone()[0]
+            conn.execute(
+                "INSERT INTO residents (person_id, label) VALUES (?, ?) "
+                "ON CONFLICT(person_id) DO UPDATE SET label = excluded.label",
+                (person_id, label),
+            )
+            conn.execute("COMMIT")
+            return label
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def mark_enrolled(self, person_ids, when: Optional[float] = None):
+        when = time.time() if when is None else when
+        with self._conn() as conn:
+            conn.executemany(
+                "UPDATE residents SET enrolled_at = ? WHERE person_id = ?", [(when, p) for p in person_ids]
+            )
+
+    # ---------------- migration ----------------
+    def _import_legacy(self):
+        """registry.txt (id|note|tick) + id_to_name.pkl -> database, once."""
+        registry_txt = os.path.join(self.face_dir, LEGACY_REGISTRY_FILE)
+        labels_pkl = os.path.join(self.face_dir, LEGACY_LABELS_FILE)
+        training_dir = os.path.join(self.face_dir, "training_data")
+
+        rows = {}
+        if os.path.exists(registry_txt):
+            with open(registry_txt) as f:
+                for line in f:
+                    parts = line.strip().split("|")
+                    if parts[0]:
+                        rows[parts[0]] = parts[1] if len(parts) > 1 else ""
+        id_to_name = {}
+        if os.path.exists(labels_pkl):
+            with open(labels_pkl, "rb") as f:
+                id_to_name = pickle.load(f)
+        if not rows and not id_to_name:
+            return
+
+        with self._conn() as conn:
+            for person_id in set(rows) | set(id_to_name.values()):
+                person_dir = os.path.join(training_dir, person_id)
+                photos = _photo_count(person_dir)
+                # the old tick value is not a wall-clock time, so created_at stays NULL
+                conn.execute(
+                    "INSERT OR IGNORE INTO residents (person_id, note, photo_count) VALUES (?, ?, ?)",
+                    (person_id, rows.get(person_id, ""), photos),
+                )
+            conn.executemany(
+                "UPDATE residents SET label = ? WHERE person_id = ?",
+                [(int(label), person_id) for label, person_id in id_to_name.items()],
+            )
+        print(f"Resident registry: imported {len(set(rows) | set(id_to_name.values()))} residents into {self.path}")
+
+
+def _photo_count(person_dir: str) -> int:
+    if not os.path.isdir(person_dir):
+        return 0
+    crops = load_person_crops(person_dir)
+    if crops is not None:
+        return len(crops)
+    return len([n for n in os.listdir(person_dir) if n.endswith(".jpg")])
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(face_dir: str = ".") -> ResidentRegistry:
+    """Process-wide registry per face_dir."""
+    key = os.path.abspath(face_dir)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = ResidentRegistry(face_dir)
+        return registry
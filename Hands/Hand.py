@@ -2,91 +2,202 @@ import cv2
 import mediapipe as mp
 import numpy as np
 import time
-from collections import deque
-from pathlib import Path
-from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
-THIS_DIR = Path(__file__).resolve().parent
-MODEL_PATH = (THIS_DIR / "hand_landmarker.task").resolve()
-if not MODEL_PATH.exists():
-    raise FileNotFoundError(f"Hand model not found at: {MODEL_PATH}")
+from profiling import get_stage_timer
+# hand_landmarker.task is read once by the models registry (shared with Perception)
+from models import acquire_landmarker, release_landmarker
 
+try:
+    from Hands.flow_gate import FlowPrefilter
+except ImportError:
+    # run as a script from this folder
+    from flow_gate import FlowPrefilter
+
+# ============================================================
+# Sliding window of hand centroids
+# ============================================================
+class MovementWindow:
+    """
+    Fixed-size ring of (t, x, y) hand centroids; metrics() looks at the
+    samples from the last `window_sec`:
+
+      displacement -> extent of the centroid box (max - min), pixels
+      path_length  -> sum of step lengths, pixels
+      variance     -> x variance + y variance, pixels^2
+
+    A single noisy frame pair cannot trigger "moved"; the hand has to cover
+    the distance within the window.
+    """
+
+    def __init__(self, window_sec: float = 0.75, capacity: int = 64):
+        self.window_sec = window_sec
+        self.capacity = capacity
+        self._t = np.zeros(capacity, dtype=np.float64)
+        self._xy = np.zeros((capacity, 2), dtype=np.float64)
+        self._count = 0
+
+    def reset(self):
+        self._count = 0
+
+    def add(self, t: float, xy):
+        i = self._count % self.capacity
+        self._t[i] = t
+        self._xy[i] = xy
+        self._count += 1
+
+    def samples(self, now: float) -> np.ndarray:
+        n = min(self._count, self.capacity)
+        order = np.arange(self._count - n, self._count) % self.capacity
+        keep = order[now - self._t[order] <= self.window_sec]
+        return self._xy[keep]
+
+    def metrics(self, now: float) -> dict:
+        xy = self.samples(now)
+        if len(xy) < 2:
+            return {"samples": len(xy), "displacement": 0.0, "path_length": 0.0, "variance": 0.0}
+        return {
+            "samples": len(xy),
+            "displacement": float(np.linalg.norm(xy.max(axis=0) - xy.min(axis=0))),
+            "path_length": float(np.linalg.norm(np.diff(xy, axis=0), axis=1).sum()),
+            "variance": float(xy.var(axis=0).sum()),
+        }
+
+
+# ============================================================
+# Hand landmarker (VIDEO mode: tracks between frames)
+# ============================================================
 class HandMovementDetector:
-    def __init__(self):
-        base_options = python.BaseOptions(model_asset_path=str(MODEL_PATH))
-        options = vision.HandLandmarkerOptions(
-            base_options=base_options,
-            num_hands=1,
-            min_hand_detection_confidence=0.5,
-            min_hand_presence_confidence=0.5,
-            min_tracking_confidence=0.5
+    """
+    video=True runs the landmarker in VIDEO mode (detect_for_video): the
+    palm detector only runs when tracking is lost, which is most of the
+    per-frame cost of IMAGE mode. Timestamps must increase; they are taken
+    from the caller's capture time (or the monotonic clock).
+    """
+
+    def __init__(self, video: bool = True, window_sec: float = 0.75):
+        self.video = video
+        self.detector = acquire_landmarker(
+            "hand", vision.RunningMode.VIDEO if video else vision.RunningMode.IMAGE
         )
-        self.detector = vision.HandLandmarker.create_from_options(options)
-        self.positions = deque(maxlen=30)
+        self.positions = MovementWindow(window_sec)
+        self._last_ts_ms = -1
+
+    def detect_center(self, frame_bgr, t: float | None = None):
+        """Hand centroid in pixels (float x, y) or None; also appended to `positions`."""
+        t = time.monotonic() if t is None else t
 
-    def detect_center(self, frame_bgr):
         # mediapipe Image expects SRGB data; convert BGR->RGB
         frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
-        result = self.detector.detect(mp_image)
+        if self.video:
+            ts_ms = max(int(t * 1000), self._last_ts_ms + 1)
+            self._last_ts_ms = ts_ms
+            result = self.detector.detect_for_video(mp_image, ts_ms)
+        else:
+            result = self.detector.detect(mp_image)
 
         if not result.hand_landmarks:
             return None
 
         h, w = frame_bgr.shape[:2]
-        pts = [(int(l.x * w), int(l.y * h)) for l in result.hand_landmarks[0]]
-        cx = int(np.mean([p[0] for p in pts]))
-        cy = int(np.mean([p[1] for p in pts]))
-        return (cx, cy)
+        pts = np.array([(l.x, l.y) for l in result.hand_landmarks[0]], dtype=np.float64)
+        center = pts.mean(axis=0) * (w, h)
+        self.positions.add(t, center)
+        return float(center[0]), float(center[1])
 
     def close(self):
-        self.detector.close()
+        release_landmarker(self.detector)
 
 def hand_moved(
     seconds: float = 3.0,
     camera_index: int = 0,
     pixel_delta_threshold: float = 18.0,
     min_detections: int = 3,
+    frame_bus=None,
+    pose_service=None,
+    window_sec: float = 0.75,
+    video_mode: bool = True,
+    prefilter: bool = False,
 ) -> bool:
     """
-    Returns True if the hand center moves by >= pixel_delta_threshold
-    (after at least min_detections detections) within `seconds`.
+    Returns True if, within `seconds`, the hand center covers
+    >= pixel_delta_threshold (extent of its positions over the last
+    `window_sec`, at least min_detections detections in that window).
+
+    video_mode=True tracks the hand between frames (detect_for_video)
+    instead of running full palm detection on every frame.
+
+    prefilter=True (opt-in, like check_hand_and_face's motion_prefilter)
+    runs a downscaled optical-flow check (Hands.flow_gate) first; the
+    landmarker only runs on frames around visible motion (and once a second
+    otherwise) to confirm that it is a hand.
+
+    Pass a Camera.frame_bus.FrameBus as `frame_bus` to read from the shared
+    camera instead of opening `camera_index`.
+
+    With a running Body.pose_service.PoseService as `pose_service`, movement
+    comes from the pose wrist/finger landmarks (Perception.pose_response);
+    the hand model is only loaded and run on frames where the pose does not
+    see a hand.
     """
-    cap = cv2.VideoCapture(camera_index)
-    detector = HandMovementDetector()
+    cap = frame_bus.subscribe() if frame_bus is not None else cv2.VideoCapture(camera_index)
+    detector = None
 
-    start = time.time()
-    detections = 0
-    prev_center = None
+    monitor = None
+    if pose_service is not None:
+        from Perception.pose_response import PoseHandMonitor
+        monitor = PoseHandMonitor(pose_service).start()
+
+    timer = get_stage_timer("hand_moved")
+    flow = FlowPrefilter(max_interval=1.0) if prefilter else None
+
+    start = time.monotonic()
 
     try:
-        while time.time() - start < seconds:
+        while time.monotonic() - start < seconds:
+            timer.start()
             ret, frame = cap.read()
             if not ret:
                 break
+            # capture time from the shared bus when available
+            t = getattr(cap, "last_timestamp", None) or time.monotonic()
+            timer.lap("read")
 
-            frame = cv2.flip(frame, 1)
-
-            center = detector.detect_center(frame)
+            if monitor is not None:
+                if monitor.moved:
+                    return True
+                if monitor.confident():
+                    if detector is not None:
+                        detector.positions.reset()  # pixel track restarts if the pose loses the hand
+                    continue
+
+            # no mirror flip: movement magnitude does not depend on it
+
+            if flow is not None:
+                run = flow.should_check(frame, t)
+                timer.lap("flow")
+                if not run:
+                    continue
+
+            if detector is None:
+                detector = HandMovementDetector(video=video_mode, window_sec=window_sec)
+            center = detector.detect_center(frame, t)
+            timer.lap("detect")
             if center is None:
                 continue
 
-            detections += 1
-
-            if prev_center is not None:
-                dx = center[0] - prev_center[0]
-                dy = center[1] - prev_center[1]
-                delta = (dx * dx + dy * dy) ** 0.5
-
-                if detections >= min_detections and delta >= pixel_delta_threshold:
-                    return True
-
-            prev_center = center
+            m = detector.positions.metrics(t)
+            timer.lap("metrics")
+            if m["samples"] >= min_detections and m["displacement"] >= pixel_delta_threshold:
+                return True
 
-        return False
+        return bool(monitor is not None and monitor.moved)
 
     finally:
+        if monitor is not None:
+            monitor.stop()
         cap.release()
         cv2.destroyAllWindows()
-        detector.close()
+        if detector is not None:
+            detector.close()
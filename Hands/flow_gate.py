@@ -0,0 +1,95 @@
+import time
+
+import cv2
+import numpy as np
+
+
+# ============================================================
+# Optical-flow pre-filter for the hand landmarker
+# ============================================================
+class FlowPrefilter:
+    """
+    Cheap "did something move" test in front of the hand landmarker.
+
+    Sparse Lucas-Kanade flow of a fixed point grid (every `grid_step`
+    pixels) between consecutive frames downscaled to `width` pixels; ~1 ms
+    at 160 px, where dense Farneback costs ~4 ms. A frame counts as moving
+    when more than `min_fraction` of the grid points moved by
+    >= `flow_thresh` (downscaled pixels).
+
+    should_check() is True on motion, for `hold_seconds` after it, and at
+    least every `max_interval` seconds so a hand that is already raised and
+    still is not missed by presence checks.
+
+    Counters: checked (frames seen), passed (frames sent to the landmarker).
+    """
+
+    def __init__(
+        self,
+        width: int = 160,
+        grid_step: int = 6,
+        flow_thresh: float = 1.0,
+        min_fraction: float = 0.02,
+        hold_seconds: float = 0.5,
+        max_interval: float = 0.5,
+    ):
+        self.width = width
+        self.grid_step = grid_step
+        self.flow_thresh = flow_thresh
+        self.min_fraction = min_fraction
+        self.hold_seconds = hold_seconds
+        self.max_interval = max_interval
+
+        self.checked = 0
+        self.passed = 0
+        self.reset()
+
+    def reset(self):
+        self._prev = None
+        self._grid = None
+        self._last_motion = None
+        self._last_pass = None
+
+    def _small_gray(self, frame_bgr: np.ndarray) -> np.ndarray:
+        h, w = frame_bgr.shape[:2]
+        scale = min(1.0, self.width / float(w))
+        small = frame_bgr if scale == 1.0 else cv2.resize(
+            frame_bgr, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA
+        )
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def motion(self, frame_bgr: np.ndarray) -> float:
+        """Fraction of grid points moving since the previous call."""
+        gray = self._small_gray(frame_bgr)
+        prev, self._prev = self._prev, gray
+        if prev is None or prev.shape != gray.shape:
+            self._grid = None
+            return 0.0
+
+        if self._grid is None:
+            h, w = gray.shape
+            half = self.grid_step // 2
+            ys, xs = np.mgrid[half:h:self.grid_step, half:w:self.grid_step]
+            self._grid = np.stack([xs.ravel(), ys.ravel()], axis=1).astype(np.float32).reshape(-1, 1, 2)
+
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(prev, gray, self._grid, None, winSize=(9, 9), maxLevel=2)
+        d = (moved - self._grid).reshape(-1, 2)
+        hit = (status.ravel() == 1) & ((d * d).sum(axis=1) >= self.flow_thresh * self.flow_thresh)
+        return float(np.count_nonzero(hit)) / len(d)
+
+    def should_check(self, frame_bgr: np.ndarray, t: float | None = None) -> bool:
+        t = time.monotonic() if t is None else t
+        self.checked += 1
+
+        if self.motion(frame_bgr) >= self.min_fraction:
+            self._last_motion = t
+
+        run = (
+            self._last_pass is None
+            or (self._last_motion is not None and t - self._last_motion <= self.hold_seconds)
+            or t - self._last_pass >= self.max_interval
+        )
+        if run:
+            self._last_pass = t
+            self.passed += 1
+        return run
@@ -6,31 +6,29 @@ from typing import Optional
 import cv2
 import numpy as np
 import os
-import pickle
+import sqlite3
+
+from profiling import get_stage_timer
+from FacialRecognition.face_detector import FaceDetector, load_face_cascade
+from FacialRecognition.model_store import load_index, model_signature
+from FacialRecognition.resident_registry import get_registry
+from Hands.flow_gate import FlowPrefilter
 
 # ----------------------------
 # Face setup (LBPH optional)
 # ----------------------------
-def _load_face_components(face_dir: str):
-    face_cascade = cv2.CascadeClassifier(
-        cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-    )
-
-    recognizer = None
-    id_to_name = {}
+def _load_face_model(face_dir: str):
+    """(GalleryIndex of the LBPH histograms or None, label -> resident ID lookup)."""
+    # trained_model.lbph is memory-mapped; a legacy trained_model.yml is parsed
+    # (needs opencv-contrib-python). Names are live registry lookups, opened
+    # only with a model: a check must not create registry.db as a side effect
+    index = load_index(face_dir)
+    return index, (get_registry(face_dir).names if index is not None else {})
 
-    model_path = os.path.join(face_dir, "trained_model.yml")
-    pkl_path = os.path.join(face_dir, "id_to_name.pkl")
-
-    # recognizer requires opencv-contrib-python
-    if os.path.exists(model_path):
-        recognizer = cv2.face.LBPHFaceRecognizer_create()
-        recognizer.read(model_path)
-
-    if os.path.exists(pkl_path):
-        with open(pkl_path, "rb") as f:
-            id_to_name = pickle.load(f)
 
+def _load_face_components(face_dir: str):
+    face_cascade = load_face_cascade()
+    recognizer, id_to_name = _load_face_model(face_dir)
     return face_cascade, recognizer, id_to_name
 
 
@@ -38,26 +36,14 @@ def _load_face_components(face_dir: str):
 # Hand setup (MediaPipe Tasks)
 # ----------------------------
 import mediapipe as mp
-from pathlib import Path
-from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
-THIS_DIR = Path(__file__).resolve().parent
-HAND_MODEL_PATH = (THIS_DIR / "hand_landmarker.task").resolve()
-if not HAND_MODEL_PATH.exists():
-    raise FileNotFoundError(f"Hand model not found at: {HAND_MODEL_PATH}")
+# hand_landmarker.task is read once by the models registry (shared with Hands)
+from models import acquire_landmarker, release_landmarker
 
 class HandDetector:
     def __init__(self):
-        base = python.BaseOptions(model_asset_path=str(HAND_MODEL_PATH))
-        options = vision.HandLandmarkerOptions(
-            base_options=base,
-            num_hands=1,
-            min_hand_detection_confidence=0.5,
-            min_hand_presence_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
-        self.detector = vision.HandLandmarker.create_from_options(options)
+        self.detector = acquire_landmarker("hand", vision.RunningMode.IMAGE)
 
     def hand_present(self, frame_bgr: np.ndarray) -> bool:
         # MP expects SRGB => give it RGB data
@@ -67,7 +53,122 @@ class HandDetector:
         return bool(res.hand_landmarks)
 
     def close(self):
-        self.detector.close()
+        release_landmarker(self.detector)
+
+
+def _detect_face(frame_bgr: np.ndarray, face_detector: FaceDetector, recognizer, timer=None):
+    """(face found, LBPH label, LBPH confidence) for the first face; label/conf None without a model."""
+    gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+    faces = face_detector.detect(gray)
+    if timer is not None:
+        timer.lap("face_detect")
+    if len(faces) == 0:
+        return False, None, None
+    if recognizer is None:
+        return True, None, None
+
+    # Try recognizing first face
+    x, y, w, h = faces[0]
+    roi = gray[y:y+h, x:x+w]
+    roi = cv2.resize(roi, (200, 200))
+    pid, conf = recognizer.predict(roi)
+    if timer is not None:
+        timer.lap("face_predict")
+    return True, int(pid), float(conf)
+
+
+# ----------------------------
+# Resident engine (detectors kept warm between checks)
+# ----------------------------
+class PresenceEngine:
+    """
+    Holds the Haar cascade, the LBPH model (as a GalleryIndex) + id map and
+    the HandDetector for one face_dir so check_hand_and_face() does not
+    rebuild them per call.
+
+    The cascade and hand model never change and are loaded once. The face
+    model is reloaded when trained_model.lbph (or a legacy .yml) changes on
+    disk (mtime + size, checked once per acquire()); label -> ID lookups go
+    to the resident registry, so new enrollments need no reload.
+
+    load_ms records how long each component took to load; the per-call
+    acquire cost goes to the "presence" StageTimer as "engine_acquire".
+    """
+
+    def __init__(self, face_dir: str = ".", with_hand: bool = True):
+        self.face_dir = face_dir
+        self.with_hand = with_hand
+
+        self.face_cascade = None
+        self.recognizer = None
+        self.id_to_name = {}
+        self.hand = None
+
+        self.load_ms = {}
+        self.model_loads = 0
+        self._signature = None
+        self._lock = threading.Lock()
+        # HandLandmarker / LBPH are not shared across concurrent checks
+        self.run_lock = threading.Lock()
+
+    def _timed(self, name, fn):
+        t0 = time.perf_counter()
+        out = fn()
+        self.load_ms[name] = (time.perf_counter() - t0) * 1000.0
+        return out
+
+    def _refresh_face_model(self):
+        sig = model_signature(self.face_dir)
+        if sig == self._signature:
+            return
+        try:
+            self.recognizer, self.id_to_name = self._timed(
+                "face_model", lambda: _load_face_model(self.face_dir)
+            )
+        except (cv2.error, OSError, ValueError, sqlite3.Error) as e:
+            # file caught mid-write by training: keep the old model; the finished
+            # write changes the signature again, so it is retried then (not on
+            # every acquire)
+            print(f"PresenceEngine: face model reload failed ({e}); keeping previous model")
+            self._signature = sig
+            return
+        self._signature = sig
+        self.model_loads += 1
+
+    def acquire(self):
+        """Returns (face_cascade, recognizer, id_to_name, hand), loading what is missing."""
+        with self._lock:
+            if self.face_cascade is None:
+                self.face_cascade = self._timed("face_cascade", load_face_cascade)
+            if self.hand is None and self.with_hand:
+                self.hand = self._timed("hand_detector", HandDetector)
+            self._refresh_face_model()
+            return self.face_cascade, self.recognizer, self.id_to_name, self.hand
+
+    def warm(self):
+        """Loads everything now (call at startup, off the post-fall path)."""
+        self.acquire()
+        return self
+
+    def close(self):
+        with self._lock:
+            if self.hand is not None:
+                self.hand.close()
+                self.hand = None
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_presence_engine(face_dir: str = ".") -> PresenceEngine:
+    """Process-wide engine per face_dir."""
+    key = os.path.abspath(face_dir)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = PresenceEngine(face_dir)
+        return engine
 
 
 @dataclass
@@ -75,6 +176,11 @@ class PresenceResult:
     saw_hand: bool
     saw_face: bool
     face_id: Optional[str] = None  # known ID if recognized (else None)
+    elapsed: float = 0.0           # seconds until return (< window on early exit)
+    hand_frames: int = 0           # frames the hand worker evaluated
+    hand_moved: bool = False       # hand_source="pose": a hand moved during the window (= saw_hand via pose)
+    pose_frames: int = 0           # hand_source="pose": pose frames evaluated
+    face_frames: int = 0           # frames the face worker evaluated
 
     @property
     def status(self) -> str:
@@ -87,12 +193,16 @@ class PresenceResult:
         return "neither"
 
 
+# when check_hand_and_face may return before `seconds` is up
+EARLY_EXIT_POLICIES = ("never", "hand", "hand_or_known_face", "any")
+
+
 def check_hand_and_face(
     seconds: float = 3.0,
     camera_index: int = 0,
 
     # face options
-    face_dir: str = ".",                  # folder with trained_model.yml + id_to_name.pkl
+    face_dir: str = ".",                  # folder with trained_model.lbph + registry.db
     require_recognized_face: bool = False, # if True: only count face if model recognizes it
     face_confidence_threshold: float = 50.0,  # LBPH: lower = stricter
 
@@ -101,116 +211,215 @@ def check_hand_and_face(
     face_fps_limit: float = 10.0,
 
     show_window: bool = False,
+
+    # shared camera (Camera.frame_bus.FrameBus); None -> open camera_index
+    frame_bus=None,
+
+    # warm detectors (PresenceEngine); None -> get_presence_engine(face_dir)
+    engine: Optional[PresenceEngine] = None,
+
+    # "never" | "hand" | "hand_or_known_face" | "any" (hand or counted face)
+    early_exit: str = "never",
+
+    # "thread": hand/face workers are threads of this process
+    # "process": they run in resident worker processes fed through a
+    #            shared-memory frame ring (Perception.process_workers)
+    backend: str = "thread",
+
+    # "landmarker": MediaPipe hand model on every frame
+    # "pose": hands from a running Body.pose_service.PoseService (landmarks
+    #         15-22); a hand counts only once it moves. The hand model only
+    #         runs while the pose does not see a hand
+    hand_source: str = "landmarker",
+    pose_service=None,
+
+    # optical-flow first pass (Hands.flow_gate.FlowPrefilter) in the hand
+    # worker: the landmarker runs on motion and at least every 0.5 s
+    motion_prefilter: bool = False,
 ) -> PresenceResult:
     """
     Runs for `seconds`, using ONE camera stream, and reports whether it saw:
       - a hand (MediaPipe)
       - a face (haar cascade; optionally recognized by LBPH)
-    Returns summary at the end: hand/face/neither/both.
+    Returns summary at the end: hand/face/neither/both, or as soon as the
+    `early_exit` condition is met.
+
+    Frames are handed to the workers through a condition variable with a
+    sequence number: each worker sleeps until a newer frame exists (or its
+    fps limit allows), takes a reference to the newest one and never sees
+    the same frame twice. Published frames are never modified, so no copy
+    is made. All threads are joined before returning.
     """
-
-    lock = threading.Lock()
+    if early_exit not in EARLY_EXIT_POLICIES:
+        raise ValueError(f"early_exit must be one of {EARLY_EXIT_POLICIES}, got {early_exit!r}")
+    if backend not in ("thread", "process"):
+        raise ValueError(f"backend must be 'thread' or 'process', got {backend!r}")
+    if hand_source not in ("landmarker", "pose"):
+        raise ValueError(f"hand_source must be 'landmarker' or 'pose', got {hand_source!r}")
+    if hand_source == "pose" and (pose_service is None or backend != "thread"):
+        raise ValueError("hand_source='pose' needs a pose_service and the thread backend")
+
+    cond = threading.Condition()
     latest_frame: Optional[np.ndarray] = None
+    latest_seq = 0
     stop = threading.Event()
+    done = threading.Event()  # early-exit condition met (or camera gone)
 
     saw_hand = False
     saw_face = False
     face_id: Optional[str] = None
-
-    face_cascade, recognizer, id_to_name = _load_face_components(face_dir)
-    hand = HandDetector()
+    hand_frames = face_frames = pose_frames = 0
+    moved = False
+
+    # per-stage timings ("presence" StageTimer); each thread keeps its own lap mark
+    timer = get_stage_timer("presence")
+
+    workers = None
+    timer.start()
+    if backend == "process":
+        from Perception.process_workers import get_process_workers
+        workers = get_process_workers(face_dir)
+        workers.configure(hand_fps_limit, face_fps_limit)
+        id_to_name = workers.labels()
+        hand = face_cascade = recognizer = None
+        run_lock = workers.run_lock
+    else:
+        if engine is None:
+            engine = get_presence_engine(face_dir)
+        face_cascade, recognizer, id_to_name, hand = engine.acquire()
+        run_lock = engine.run_lock
+    timer.lap("engine_acquire")
+
+    def on_hand(present: bool):
+        nonlocal saw_hand, hand_frames
+        hand_frames += 1
+        if present:
+            saw_hand = True
+            check_done()
+
+    def on_pose_hand(present: bool, hand_moved: bool):
+        # the person who fell is in view of the pose stream anyway, so a
+        # visible hand alone is no response: only a moving one counts
+        nonlocal saw_hand, moved, pose_frames
+        pose_frames += 1
+        if hand_moved:
+            moved = saw_hand = True
+            check_done()
+
+    monitor = None  # PoseHandMonitor, built below once the run lock is held
+
+    def on_face(found: bool, pid, conf):
+        nonlocal saw_face, face_id, face_frames
+        face_frames += 1
+        if not found:
+            return
+        if pid is None:
+            # Face is present, no recognizer
+            if not require_recognized_face:
+                saw_face = True
+        elif conf < face_confidence_threshold:
+            saw_face = True
+            face_id = id_to_name.get(pid)
+        elif not require_recognized_face:
+            saw_face = True
+        check_done()
+
+    def check_done():
+        if early_exit == "hand" and saw_hand:
+            done.set()
+        elif early_exit == "hand_or_known_face" and (saw_hand or face_id is not None):
+            done.set()
+        elif early_exit == "any" and (saw_hand or saw_face):
+            done.set()
+
+    def next_frame(last_seq: int, min_dt: float, last_t: float):
+        """Blocks until the fps limit allows and a frame newer than last_seq exists."""
+        wait = last_t + min_dt - time.monotonic()
+        if wait > 0 and stop.wait(wait):
+            return None, last_seq
+        with cond:
+            cond.wait_for(lambda: stop.is_set() or latest_seq > last_seq)
+            if stop.is_set():
+                return None, last_seq
+            return latest_frame, latest_seq
 
     # ------------ Camera producer ------------
     def camera_loop():
-        nonlocal latest_frame
-        cap = cv2.VideoCapture(camera_index)
-        if not cap.isOpened():
-            stop.set()
-            return
+        nonlocal latest_frame, latest_seq
+        cap = frame_bus.subscribe() if frame_bus is not None else cv2.VideoCapture(camera_index)
         try:
+            if not cap.isOpened():
+                return
             while not stop.is_set():
+                timer.start()
                 ret, frame = cap.read()
                 if not ret:
                     break
-                frame = cv2.flip(frame, 1)
-                with lock:
-                    latest_frame = frame
+                timer.lap("camera_read")
+                if workers is not None:
+                    # flipped straight into the shared-memory slot
+                    frame = workers.publish(frame, flip=True)
+                else:
+                    frame = cv2.flip(frame, 1)  # new array; never written after publishing
+                    with cond:
+                        latest_frame = frame
+                        latest_seq += 1
+                        cond.notify_all()
+                timer.lap("camera_flip")
 
                 if show_window:
                     cv2.imshow("Presence Check", frame)
                     if cv2.waitKey(1) & 0xFF == ord("q"):
-                        stop.set()
                         break
         finally:
             cap.release()
             if show_window:
                 cv2.destroyAllWindows()
+            # no more frames: wake the workers and the caller
+            stop.set()
+            done.set()
+            with cond:
+                cond.notify_all()
 
     # ------------ Hand worker ------------
     def hand_loop():
-        nonlocal saw_hand
+        flow = FlowPrefilter() if motion_prefilter else None
         min_dt = 1.0 / max(1e-6, hand_fps_limit)
-        last = 0.0
-        while not stop.is_set():
-            now = time.time()
-            if now - last < min_dt:
-                time.sleep(0.005)
-                continue
-            last = now
-
-            with lock:
-                frame = None if latest_frame is None else latest_frame.copy()
+        last_seq, last_t = 0, float("-inf")
+        while True:
+            frame, last_seq = next_frame(last_seq, min_dt, last_t)
             if frame is None:
-                continue
+                return
+            last_t = time.monotonic()
+            if monitor is not None and monitor.confident(last_t):
+                continue  # the pose stream already sees the hands
+            timer.start()
+            if flow is not None:
+                run = flow.should_check(frame, last_t)
+                timer.lap("hand_flow")
+                if not run:
+                    continue
 
             try:
-                if hand.hand_present(frame):
-                    saw_hand = True
+                on_hand(hand.hand_present(frame))
             except Exception:
                 pass
+            timer.lap("hand_detect")
 
     # ------------ Face worker ------------
     def face_loop():
-        nonlocal saw_face, face_id
+        face_detector = FaceDetector(face_cascade)  # tracking state lives for this check
         min_dt = 1.0 / max(1e-6, face_fps_limit)
-        last = 0.0
-        while not stop.is_set():
-            now = time.time()
-            if now - last < min_dt:
-                time.sleep(0.005)
-                continue
-            last = now
-
-            with lock:
-                frame = None if latest_frame is None else latest_frame.copy()
+        last_seq, last_t = 0, float("-inf")
+        while True:
+            frame, last_seq = next_frame(last_seq, min_dt, last_t)
             if frame is None:
-                continue
+                return
+            last_t = time.monotonic()
+            timer.start()
 
             try:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                faces = face_cascade.detectMultiScale(gray, 1.3, 5)
-                if len(faces) == 0:
-                    continue
-
-                # Face is present
-                if recognizer is None:
-                    if not require_recognized_face:
-                        saw_face = True
-                    continue
-
-                # Try recognizing first face
-                x, y, w, h = faces[0]
-                roi = gray[y:y+h, x:x+w]
-                roi = cv2.resize(roi, (200, 200))
-                pid, conf = recognizer.predict(roi)
-
-                if conf < face_confidence_threshold:
-                    saw_face = True
-                    face_id = id_to_name.get(pid)
-                else:
-                    if not require_recognized_face:
-                        saw_face = True
-
+                on_face(*_detect_face(frame, face_detector, recognizer, timer))
             except Exception:
                 pass
 
@@ -219,21 +428,54 @@ def check_hand_and_face(
     t_hand = threading.Thread(target=hand_loop, daemon=True)
     t_face = threading.Thread(target=face_loop, daemon=True)
 
-    t_cam.start()
-    t_hand.start()
-    t_face.start()
-
-    # Run fixed window
-    start = time.time()
-    while time.time() - start < seconds:
-        time.sleep(0.02)
-
-    stop.set()
-
-    # Cleanup
+    # held from here to the finally below, so any setup failure still releases it
+    run_lock.acquire()
+    start = time.monotonic()
     try:
-        hand.close()
-    except Exception:
-        pass
-
-    return PresenceResult(saw_hand=saw_hand, saw_face=saw_face, face_id=face_id)
+        if hand_source == "pose":
+            from Perception.pose_response import PoseHandMonitor
+            monitor = PoseHandMonitor(pose_service, on_update=on_pose_hand)
+            monitor.start()
+        t_cam.start()
+        if workers is None:
+            t_hand.start()
+            t_face.start()
+            # Run fixed window (or until the early-exit condition)
+            done.wait(seconds)
+        else:
+            # worker processes reply with small records; only frames
+            # published during this call count
+            since = workers.seq
+            deadline = start + seconds
+            while not done.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                rec = workers.next_result(min(remaining, 0.1))
+                if rec is None or rec[1] <= since:
+                    continue
+                if rec[0] == "hand":
+                    on_hand(rec[2])
+                else:
+                    on_face(*rec[2:])
+    finally:
+        stop.set()
+        with cond:
+            cond.notify_all()
+        if monitor is not None:
+            monitor.stop()
+
+        # workers finish their current detection; the camera thread returns
+        # after its current read and releases the capture
+        for t in (t_hand, t_face, t_cam):
+            if t.is_alive():
+                t.join()
+        # detectors stay loaded (engine / worker processes) for the next check
+        run_lock.release()
+
+    return PresenceResult(
+        saw_hand=saw_hand, saw_face=saw_face, face_id=face_id,
+        elapsed=time.monotonic() - start,
+        hand_frames=hand_frames, face_frames=face_frames,
+        hand_moved=moved, pose_frames=pose_frames,
+    )
@@ -0,0 +1,158 @@
+"""
+Hand presence / movement from the pose stream (landmarks 15-22: wrists,
+pinky, index and thumb tips), so the post-fall response check does not need
+its own hand model while the pose is clearly visible.
+
+    monitor = PoseHandMonitor(pose_service).start()   # pose keeps running, no fall events
+    ...
+    monitor.confident()   -> pose currently sees a hand well enough
+    monitor.saw_hand / monitor.moved
+    monitor.stop()
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+import numpy as np
+
+from Body.body import landmarks_to_array
+
+LEFT_HAND = (15, 17, 19, 21)    # wrist, pinky, index, thumb
+RIGHT_HAND = (16, 18, 20, 22)
+SHOULDERS = (11, 12)
+
+
+# ============================================================
+# Per-frame hand measurement from pose landmarks
+# ============================================================
+class PoseHandTracker:
+    """
+    Keeps a short history of each hand's centroid (mean of its visible
+    points 15-22) and reports presence and movement.
+
+    Movement is the largest extent of a hand's centroid over the last
+    `window_sec`, relative to shoulder width, so it does not depend on how
+    far the person is from the camera. `move_thresh=0.15` is roughly a hand
+    moved by a sixth of the shoulder width.
+
+    A hand counts as present (and the frame as confident) when it has
+    `min_points` points with visibility >= `min_visibility`.
+    """
+
+    def __init__(
+        self,
+        min_visibility: float = 0.6,
+        min_points: int = 2,
+        window_sec: float = 1.0,
+        move_thresh: float = 0.15,
+        min_samples: int = 3,
+    ):
+        self.min_visibility = min_visibility
+        self.min_points = min_points
+        self.window_sec = window_sec
+        self.move_thresh = move_thresh
+        self.min_samples = min_samples
+        self.reset()
+
+    def reset(self):
+        self._hist = {"left": deque(), "right": deque()}
+        self.last_confident_t: Optional[float] = None
+
+    def _centroid(self, lms: np.ndarray, idx):
+        pts = lms[list(idx)]
+        vis = pts[:, 3] >= self.min_visibility
+        if int(vis.sum()) < self.min_points:
+            return None
+        return pts[vis, :2].mean(axis=0)
+
+    def update(self, landmarks, t: float):
+        """Returns (present, moved) for this frame."""
+        if landmarks is None:
+            return False, False
+        lms = landmarks if isinstance(landmarks, np.ndarray) else landmarks_to_array(landmarks)
+
+        sh = lms[list(SHOULDERS)]
+        scale = float(np.linalg.norm(sh[0, :2] - sh[1, :2]))
+        if not (sh[:, 3] >= self.min_visibility).all() or scale < 1e-3:
+            scale = 0.2  # typical shoulder width in normalized coords
+
+        present = moved = False
+        for side, idx in (("left", LEFT_HAND), ("right", RIGHT_HAND)):
+            hist = self._hist[side]
+            while hist and t - hist[0][0] > self.window_sec:
+                hist.popleft()
+            c = self._centroid(lms, idx)
+            if c is None:
+                continue
+            present = True
+            hist.append((t, c))
+            if len(hist) >= self.min_samples:
+                xy = np.array([p for _, p in hist])
+                extent = float(np.linalg.norm(xy.max(axis=0) - xy.min(axis=0)))
+                if extent / scale >= self.move_thresh:
+                    moved = True
+
+        if present:
+            self.last_confident_t = t
+        return present, moved
+
+
+# ============================================================
+# Attaches a tracker to a running PoseService
+# ============================================================
+class PoseHandMonitor:
+    """
+    Subscribes a PoseHandTracker to a Body.pose_service.PoseService and runs
+    the service without fall detection for the duration of a check.
+
+    `on_update(present, moved)` (optional) is called for every pose frame
+    on the inference thread. confident() is True while the pose has seen a
+    hand within the last `stale_sec`; callers run the dedicated hand
+    landmarker only when it is False.
+    """
+
+    def __init__(self, pose_service, tracker: Optional[PoseHandTracker] = None,
+                 on_update: Optional[Callable[[bool, bool], None]] = None, stale_sec: float = 0.3):
+        self.pose_service = pose_service
+        self.tracker = tracker or PoseHandTracker()
+        self.on_update = on_update
+        self.stale_sec = stale_sec
+
+        self.saw_hand = False
+        self.moved = False
+        self.frames = 0
+        self._lock = threading.Lock()
+        self._was_paused = True
+
+    def _listener(self, poses, capture_t):
+        with self._lock:
+            present, moved = self.tracker.update(poses[0] if poses else None, capture_t)
+            self.frames += 1
+            self.saw_hand |= present
+            self.moved |= moved
+        if self.on_update is not None:
+            self.on_update(present, moved)
+
+    def confident(self, now: Optional[float] = None) -> bool:
+        t = self.tracker.last_confident_t
+        if t is None:
+            return False
+        now = time.monotonic() if now is None else now
+        return now - t <= self.stale_sec
+
+    def start(self) -> "PoseHandMonitor":
+        self.tracker.reset()
+        self.saw_hand = self.moved = False
+        self.frames = 0
+        self._was_paused = self.pose_service.paused
+        self.pose_service.add_pose_listener(self._listener)
+        self.pose_service.resume(detect_falls=False)
+        return self
+
+    def stop(self):
+        self.pose_service.remove_pose_listener(self._listener)
+        if self._was_paused:
+            self.pose_service.pause()
+        else:
+            self.pose_service.resume(detect_falls=True)
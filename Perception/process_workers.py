@@ -0,0 +1,250 @@
+"""
+Process backend for check_hand_and_face(backend="process").
+
+The camera thread writes (flips) each frame straight into a
+multiprocessing.shared_memory ring; one hand process and one face process
+map the same block and read the newest slot in place. Only small records
+go back over a queue:
+
+    ("hand", seq, present)
+    ("face", seq, found, label or None, confidence or None)
+
+The processes are started once per face_dir (get_process_workers) and stay
+loaded between checks, like PresenceEngine does for the threaded path.
+"""
+import atexit
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# "spawn": children must not inherit the parent's MediaPipe / camera threads
+_ctx = mp.get_context("spawn")
+
+
+# ============================================================
+# Shared-memory frame ring
+# ============================================================
+class SharedFrameRing:
+    """
+    `slots` frames of `shape` (uint8) in one shared_memory block, preceded by
+    an int64 sequence number per slot. A slot's seq is set to -1 while it is
+    being written; readers compare it before and after using a slot and drop
+    results for frames overwritten in between.
+    """
+
+    def __init__(self, shape, slots: int = 8, name: Optional[str] = None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        header = 8 * slots
+        frame_bytes = int(np.prod(self.shape))
+        size = header + slots * frame_bytes
+
+        # only the creating process unlinks; spawned workers share its
+        # resource tracker, so attaching does not add a second owner
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+
+        self.slot_seq = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf, offset=0)
+        self.frames = np.ndarray((slots, *self.shape), dtype=np.uint8, buffer=self.shm.buf, offset=header)
+        if self.owner:
+            self.slot_seq[:] = -1
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, seq: int, frame_bgr: np.ndarray, flip: bool = False) -> np.ndarray:
+        """Writes frame `seq` into its slot and returns the slot view."""
+        i = seq % self.slots
+        slot = self.frames[i]
+        self.slot_seq[i] = -1
+        if flip:
+            cv2.flip(frame_bgr, 1, dst=slot)
+        else:
+            np.copyto(slot, frame_bgr)
+        self.slot_seq[i] = seq
+        return slot
+
+    def read(self, seq: int) -> Optional[np.ndarray]:
+        """Zero-copy view of frame `seq`, or None if its slot was reused."""
+        i = seq % self.slots
+        if self.slot_seq[i] != seq:
+            return None
+        return self.frames[i]
+
+    def still_valid(self, seq: int) -> bool:
+        return self.slot_seq[seq % self.slots] == seq
+
+    def close(self):
+        # drop our views before closing the mapping
+        self.slot_seq = self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# ============================================================
+# Worker processes
+# ============================================================
+def _worker_main(kind, face_dir, ring_name, shape, slots, cond, latest, fps_limit, shutdown, results):
+    # imported here so the (spawned) child loads MediaPipe / LBPH itself
+    from FacialRecognition.face_detector import FaceDetector
+    from Perception.check_status import HandDetector, PresenceEngine, _detect_face
+
+    ring = SharedFrameRing(shape, slots, name=ring_name)
+    hand = engine = face_detector = None
+    if kind == "hand":
+        hand = HandDetector()
+    else:
+        engine = PresenceEngine(face_dir, with_hand=False)
+        face_detector = FaceDetector(engine.acquire()[0])
+
+    last_seq, last_t = 0, float("-inf")
+    try:
+        while not shutdown.is_set():
+            wait = last_t + 1.0 / max(1e-6, fps_limit.value) - time.monotonic()
+            if wait > 0 and shutdown.wait(wait):
+                break
+            with cond:
+                cond.wait_for(lambda: shutdown.is_set() or latest.value > last_seq, timeout=0.5)
+                seq = latest.value
+            if seq <= last_seq:
+                continue
+            last_seq, last_t = seq, time.monotonic()
+
+            frame = ring.read(seq)
+            if frame is None:
+                continue
+            try:
+                if kind == "hand":
+                    rec = ("hand", seq, hand.hand_present(frame))
+                else:
+                    recognizer = engine.acquire()[1]
+                    rec = ("face", seq, *_detect_face(frame, face_detector, recognizer))
+            except Exception:
+                continue
+            if ring.still_valid(seq):
+                results.put(rec)
+    finally:
+        if hand is not None:
+            hand.close()
+        ring.close()
+
+
+class ProcessPresenceWorkers:
+    """
+    Resident hand + face worker processes for one face_dir. The ring is
+    sized on the first published frame and rebuilt (workers restarted) if
+    the camera resolution changes.
+    """
+
+    def __init__(self, face_dir: str = ".", slots: int = 8):
+        self.face_dir = face_dir
+        self.slots = slots
+        self.ring: Optional[SharedFrameRing] = None
+        self.seq = 0
+
+        self._cond = _ctx.Condition()
+        self._latest = _ctx.Value("q", 0, lock=False)
+        self._fps = {"hand": _ctx.Value("d", 8.0, lock=False), "face": _ctx.Value("d", 10.0, lock=False)}
+        self._shutdown = _ctx.Event()
+        self._results = _ctx.Queue()
+        self._procs = []
+
+        self.run_lock = threading.Lock()
+
+    def configure(self, hand_fps_limit: float, face_fps_limit: float):
+        self._fps["hand"].value = hand_fps_limit
+        self._fps["face"].value = face_fps_limit
+
+    def labels(self):
+        """label -> resident ID lookups (live view of the resident registry; empty without a model)."""
+        from FacialRecognition.model_store import has_model
+        from FacialRecognition.resident_registry import get_registry
+        return get_registry(self.face_dir).names if has_model(self.face_dir) else {}
+
+    def start(self, shape=(480, 640, 3)):
+        """
+        Sizes the ring for `shape` and (re)starts the worker processes.
+        publish() does this on the first frame; calling it at startup keeps
+        process spawn + model loading off the first check.
+        """
+        self._stop_procs()
+        if self.ring is not None:
+            self.ring.close()
+        self.ring = SharedFrameRing(shape, self.slots)
+        self._shutdown.clear()
+        self._procs = [
+            _ctx.Process(
+                target=_worker_main,
+                args=(kind, self.face_dir, self.ring.name, self.ring.shape, self.slots,
+                      self._cond, self._latest, self._fps[kind], self._shutdown, self._results),
+                name=f"presence-{kind}",
+                daemon=True,
+            )
+            for kind in ("hand", "face")
+        ]
+        for p in self._procs:
+            p.start()
+
+    def publish(self, frame_bgr: np.ndarray, flip: bool = False) -> np.ndarray:
+        """Called from the camera thread; returns the shared slot holding the frame."""
+        if self.ring is None or self.ring.shape != frame_bgr.shape:
+            self.start(frame_bgr.shape)
+        self.seq += 1
+        slot = self.ring.write(self.seq, frame_bgr, flip=flip)
+        with self._cond:
+            self._latest.value = self.seq
+            self._cond.notify_all()
+        return slot
+
+    def next_result(self, timeout: float):
+        try:
+            return self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _stop_procs(self):
+        if not self._procs:
+            return
+        self._shutdown.set()
+        with self._cond:
+            self._cond.notify_all()
+        for p in self._procs:
+            p.join(timeout=2.0)
+            if p.is_alive():
+                p.terminate()
+        self._procs = []
+
+    def close(self):
+        self._stop_procs()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def get_process_workers(face_dir: str = ".") -> ProcessPresenceWorkers:
+    """Process-wide worker pair per face_dir (call start() at startup, else started on the first frame)."""
+    key = os.path.abspath(face_dir)
+    with _workers_lock:
+        workers = _workers.get(key)
+        if workers is None:
+            workers = _workers[key] = ProcessPresenceWorkers(face_dir)
+        return workers
+
+
+@atexit.register
+def _close_all():
+    for workers in list(_workers.values()):
+        workers.close()
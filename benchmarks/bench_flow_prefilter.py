@@ -0,0 +1,95 @@
+"""
+Sparse optical-flow pre-filter vs running the hand landmarker on every frame.
+
+  python -m benchmarks.bench_flow_prefilter
+  python -m benchmarks.bench_flow_prefilter --landmarker   # also time the real hand model
+
+Synthetic 640x480 video at 30 fps with sensor noise: a skin-coloured blob
+sits still, then moves for 1 s, repeatedly. For each mode the script
+reports CPU per frame and the decision latency (motion onset -> first
+frame handed to the landmarker).
+
+The landmarker cannot confirm a drawn blob as a hand, so without
+--landmarker its cost is given as calls per second. With --landmarker
+(needs Hands/hand_landmarker.task) its measured per-call CPU is added.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from Hands.flow_gate import FlowPrefilter
+
+
+def synth_blob_video(seconds: float = 12.0, fps: float = 30.0, still: float = 2.0, moving: float = 1.0, seed: int = 0):
+    """(frames, timestamps, motion onset times) with a blob alternating still / moving."""
+    rng = np.random.default_rng(seed)
+    h, w = 480, 640
+    bg = rng.integers(40, 90, size=(h, w, 3), dtype=np.uint8)
+    frames, ts, onsets = [], [], []
+    x, y, period = 200.0, 240.0, still + moving
+    for i in range(int(seconds * fps)):
+        t = i / fps
+        phase = t % period
+        if phase >= still:
+            if phase - 1.0 / fps < still:
+                onsets.append(t)
+            x += 6.0 * np.cos(t * 4.0)
+            y += 4.0 * np.sin(t * 5.0)
+        frame = bg.copy()
+        cv2.circle(frame, (int(x), int(y)), 40, (120, 160, 210), -1)
+        noise = rng.integers(-6, 7, size=(h, w, 1), dtype=np.int16)
+        frames.append(np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8))
+        ts.append(t)
+    return frames, ts, onsets
+
+
+def landmarker_cost_ms(frames) -> float:
+    from Hands.Hand import HandMovementDetector
+
+    det = HandMovementDetector(video=False)
+    cpu0 = time.process_time()
+    for f in frames[:60]:
+        det.detect_center(f)
+    det.close()
+    return (time.process_time() - cpu0) * 1000.0 / min(60, len(frames))
+
+
+def bench(seconds: float, with_landmarker: bool):
+    frames, ts, onsets = synth_blob_video(seconds)
+    call_ms = landmarker_cost_ms(frames) if with_landmarker else None
+
+    gate = FlowPrefilter(max_interval=1.0)
+    passed = []
+    cpu0 = time.process_time()
+    for f, t in zip(frames, ts):
+        if gate.should_check(f, t):
+            passed.append(t)
+    flow_ms = (time.process_time() - cpu0) * 1000.0 / len(frames)
+
+    passed_arr = np.array(passed)
+    lat = []
+    for onset in onsets:
+        after = passed_arr[passed_arr >= onset]
+        if len(after):
+            lat.append((after[0] - onset) * 1000.0)
+
+    fps = len(frames) / seconds
+    print(f"{len(frames)} frames, {len(onsets)} motion onsets")
+    print(f"{'mode':26s} {'landmarker calls/s':>19s} {'cpu ms/frame':>13s} {'onset latency ms':>17s}")
+    every = call_ms if call_ms is not None else float("nan")
+    print(f"{'landmarker every frame':26s} {fps:19.1f} {every:13.2f} {0.0:17.1f}")
+    pre = flow_ms + (call_ms * len(passed) / len(frames) if call_ms is not None else 0.0)
+    extra = "" if call_ms is not None else "  (+ landmarker calls)"
+    print(f"{'flow pre-filter':26s} {len(passed) / seconds:19.1f} {pre:13.2f} "
+          f"{np.mean(lat) if lat else float('nan'):17.1f}{extra}")
+    print(f"flow stage alone: {flow_ms:.2f} ms/frame; frames passed {len(passed)}/{len(frames)}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=12.0)
+    ap.add_argument("--landmarker", action="store_true", help="time the real hand model too")
+    args = ap.parse_args()
+    bench(args.seconds, args.landmarker)
@@ -0,0 +1,73 @@
+"""
+LBPH predict() vs the NumPy GalleryIndex at growing resident counts.
+
+  python -m benchmarks.bench_gallery_index
+  python -m benchmarks.bench_gallery_index --people 50 100 300 --samples 30
+
+Synthetic 200x200 "faces" (smoothed noise per person, per-sample pixel
+noise). Each size trains a real cv2.face LBPH model, builds the index from
+it, and reports ms per query and how often each index mode returns the
+same label as LBPH (exact mode should always agree).
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from FacialRecognition.gallery_index import GalleryIndex
+
+
+def synth_faces(people: int, samples: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    base = [cv2.GaussianBlur(rng.integers(0, 256, (200, 200), dtype=np.uint8), (0, 0), 2) for _ in range(people)]
+
+    def variant(p):
+        noisy = base[p].astype(np.int16) + rng.integers(-6, 7, (200, 200), dtype=np.int16)
+        return np.clip(noisy, 0, 255).astype(np.uint8)
+
+    faces = [variant(p) for p in range(people) for _ in range(samples)]
+    labels = np.repeat(np.arange(people), samples).astype(np.int32)
+    queries = [variant(int(p)) for p in rng.integers(0, people, 20)]
+    return faces, labels, queries
+
+
+def time_queries(predict, queries):
+    out = []
+    t0 = time.perf_counter()
+    for q in queries:
+        out.append(predict(q))
+    return out, (time.perf_counter() - t0) * 1000.0 / len(queries)
+
+
+def bench(people_counts, samples: int):
+    print(f"{'people':>6s} {'samples':>8s} {'mode':10s} {'ms/query':>9s} {'agree':>6s} {'MB':>7s}")
+    for people in people_counts:
+        faces, labels, queries = synth_faces(people, samples)
+        lbph = cv2.face.LBPHFaceRecognizer_create()
+        lbph.train(faces, labels)
+
+        ref, ref_ms = time_queries(lbph.predict, queries)
+        n = len(faces)
+        print(f"{people:6d} {n:8d} {'lbph':10s} {ref_ms:9.1f} {'':>6s} {'':>7s}")
+
+        exact = GalleryIndex.from_recognizer(lbph)
+        modes = [
+            ("exact", exact),
+            ("averaged", exact.averaged()),
+        ]
+        for name, index in modes:
+            res, ms = time_queries(index.predict, queries)
+            agree = sum(a[0] == b[0] for a, b in zip(ref, res)) / len(ref)
+            print(f"{people:6d} {n:8d} {name:10s} {ms:9.1f} {agree:6.0%} {index.nbytes / 1e6:7.1f}")
+
+        worst = max(abs(a[1] - b[1]) for a, b in zip(ref, time_queries(exact.predict, queries)[0]))
+        print(f"{'':6s} exact vs lbph max |confidence diff| = {worst:.4f}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--people", type=int, nargs="+", default=[10, 50, 100])
+    ap.add_argument("--samples", type=int, default=30)
+    args = ap.parse_args()
+    bench(args.people, args.samples)
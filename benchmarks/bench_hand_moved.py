@@ -0,0 +1,60 @@
+"""
+Hand landmarker cost per frame: IMAGE mode (palm detection every frame)
+vs VIDEO mode (detect_for_video, tracking between frames).
+
+  python -m benchmarks.bench_hand_moved --source clip_with_hand.mp4
+  python -m benchmarks.bench_hand_moved --source 0 --frames 300
+
+Frames are read up front so only detection + centroid/window math is
+timed. CPU is process time (all MediaPipe threads), so "cpu ms/frame"
+above "wall ms/frame" means several cores were busy.
+"""
+import argparse
+import time
+
+import cv2
+
+from Hands.Hand import HandMovementDetector
+
+
+def _read_frames(source, count):
+    cap = cv2.VideoCapture(source)
+    frames = []
+    while len(frames) < count:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def bench(source, count: int = 300, fps: float = 30.0):
+    frames = _read_frames(source, count)
+    if not frames:
+        raise SystemExit(f"no frames from {source!r}")
+
+    print(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+    print(f"{'mode':8s} {'wall ms/frame':>14s} {'cpu ms/frame':>13s} {'max fps':>8s} {'hand %':>7s}")
+    for name, video in (("IMAGE", False), ("VIDEO", True)):
+        detector = HandMovementDetector(video=video)
+        found = 0
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        for i, frame in enumerate(frames):
+            if detector.detect_center(frame, i / fps) is not None:
+                found += 1
+                detector.positions.metrics(i / fps)
+        wall = (time.perf_counter() - wall0) * 1000.0 / len(frames)
+        cpu = (time.process_time() - cpu0) * 1000.0 / len(frames)
+        detector.close()
+        print(f"{name:8s} {wall:14.2f} {cpu:13.2f} {1000.0 / wall:8.1f} {100.0 * found / len(frames):6.0f}%")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--source", default="0", help="camera index or video file")
+    ap.add_argument("--frames", type=int, default=300)
+    args = ap.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    bench(source, args.frames)
@@ -0,0 +1,67 @@
+"""
+Face model load time and file size: OpenCV's trained_model.yml vs the
+binary trained_model.lbph artifact.
+
+  python -m benchmarks.bench_model_artifact
+  python -m benchmarks.bench_model_artifact --people 20 100 --samples 30
+
+For each size a real LBPH model is trained on synthetic faces and saved as
+YAML, then converted. Load = open the file and have a GalleryIndex ready;
+"first predict" adds one query, which is when a mapped file is paged in.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+
+from benchmarks.bench_gallery_index import synth_faces
+from FacialRecognition.gallery_index import GalleryIndex
+from FacialRecognition.model_store import convert_yaml
+
+
+def _timed_ms(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000.0
+
+
+def load_yaml(path: str) -> GalleryIndex:
+    lbph = cv2.face.LBPHFaceRecognizer_create()
+    lbph.read(path)
+    return GalleryIndex.from_recognizer(lbph)
+
+
+def bench(people_counts, samples: int):
+    print(f"{'people':>6s} {'samples':>8s} {'format':12s} {'MB':>7s} {'load ms':>9s} {'+1st predict ms':>16s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for people in people_counts:
+            faces, labels, queries = synth_faces(people, samples)
+            lbph = cv2.face.LBPHFaceRecognizer_create()
+            lbph.train(faces, labels)
+
+            yml = os.path.join(tmp, f"model_{people}.yml")
+            art = os.path.join(tmp, f"model_{people}.lbph")
+            lbph.save(yml)
+            _, convert_ms = _timed_ms(lambda: convert_yaml(yml, art))
+
+            rows = [
+                ("yaml", yml, lambda: load_yaml(yml)),
+                ("lbph mmap", art, lambda: GalleryIndex.load(art, mmap=True)),
+                ("lbph read", art, lambda: GalleryIndex.load(art, mmap=False)),
+            ]
+            for name, path, load in rows:
+                index, load_ms = _timed_ms(load)
+                _, predict_ms = _timed_ms(lambda: index.predict(queries[0]))
+                print(f"{people:6d} {len(faces):8d} {name:12s} {os.path.getsize(path) / 1e6:7.1f} "
+                      f"{load_ms:9.1f} {load_ms + predict_ms:16.1f}")
+            print(f"{'':6s} yaml -> lbph conversion: {convert_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--people", type=int, nargs="+", default=[10, 50])
+    ap.add_argument("--samples", type=int, default=30)
+    args = ap.parse_args()
+    bench(args.people, args.samples)
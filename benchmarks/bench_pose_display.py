@@ -0,0 +1,106 @@
+"""
+Overlay / display cost of run_pose_skeleton.
+
+  python -m benchmarks.bench_pose_display          # synthetic overlay cost
+  python -m benchmarks.bench_pose_display --live   # + real camera fps per mode
+
+The synthetic part compares the old per-landmark drawing loop against the
+vectorized draw_pose_skeleton at 1080p (frame copy + skeleton + text; the
+imshow/waitKey cost comes on top and needs --live to measure).
+
+Per drawn frame the two are level (within run-to-run noise): the cost is
+rasterizing the bones plus the frame copy, not the Python loop, so batching
+the draw calls saves only ~0.05 ms. The saving comes from drawing fewer
+frames (preview_every) or none (headless).
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from Body.body import POSE_CONNECTIONS, draw_pose_skeleton, run_pose_skeleton
+
+
+def _legacy_draw(frame_bgr, landmarks, min_visibility=0.5):
+    # the pre-vectorization implementation, kept here for comparison
+    h, w = frame_bgr.shape[:2]
+    points = []
+    for lm in landmarks:
+        if lm.visibility is not None and lm.visibility < min_visibility:
+            points.append(None)
+            continue
+        points.append((int(lm.x * w), int(lm.y * h)))
+    for a, b in POSE_CONNECTIONS:
+        if points[a] and points[b]:
+            cv2.line(frame_bgr, points[a], points[b], (0, 255, 0), 2)
+    for p in points:
+        if p:
+            cv2.circle(frame_bgr, p, 3, (0, 255, 255), -1)
+
+
+def _fake_landmarks(rng):
+    xy = rng.uniform(0.2, 0.8, size=(33, 2))
+    vis = rng.uniform(0.3, 1.0, size=33)
+    return [SimpleNamespace(x=x, y=y, z=0.0, visibility=v) for (x, y), v in zip(xy, vis)]
+
+
+def _overlay_ms(draw, preview_every, frames, frame, landmarks):
+    start = time.perf_counter()
+    for i in range(1, frames + 1):
+        if preview_every == 0 or i % preview_every != 0:
+            continue
+        canvas = frame.copy()
+        draw(canvas, landmarks)
+        cv2.putText(canvas, "OK vy=0.00", (20, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+
+def bench_synthetic(frames: int = 2000):
+    rng = np.random.default_rng(0)
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    landmarks = _fake_landmarks(rng)
+
+    modes = [
+        ("legacy, every frame", _legacy_draw, 1),
+        ("vectorized, every frame", draw_pose_skeleton, 1),
+        ("vectorized, preview_every=5", draw_pose_skeleton, 5),
+        ("headless", draw_pose_skeleton, 0),
+    ]
+    base = None
+    print(f"{'mode':32s} {'ms/frame':>10s} {'speedup':>8s}")
+    for name, draw, every in modes:
+        ms = _overlay_ms(draw, every, frames, frame, landmarks)
+        base = ms if base is None else base
+        speedup = f"{base / ms:7.1f}x" if ms > 1e-3 else "      -"
+        print(f"{name:32s} {ms:10.3f} {speedup}")
+
+
+def bench_live(seconds: float = 10.0, camera_index: int = 0):
+    import threading
+
+    for name, kwargs in [
+        ("window, every frame", {}),
+        ("window, preview_every=5", {"preview_every": 5}),
+        ("headless", {"headless": True}),
+    ]:
+        stop = threading.Event()
+        timer = threading.Timer(seconds, stop.set)
+        stats = {}
+        timer.start()
+        run_pose_skeleton(camera_index, stop, stats=stats, **kwargs)
+        timer.cancel()
+        print(f"{name:32s} {stats['fps']:6.1f} fps ({stats['frames']} frames)")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--live", action="store_true", help="also run the real pipeline on a camera")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--camera", type=int, default=0)
+    args = ap.parse_args()
+
+    bench_synthetic()
+    if args.live:
+        bench_live(args.seconds, args.camera)
@@ -0,0 +1,41 @@
+"""
+VIDEO (serial) vs LIVE_STREAM (pipelined) pose inference.
+
+  python -m benchmarks.bench_pose_inference --seconds 15
+  python -m benchmarks.bench_pose_inference --source clip.mp4
+
+Runs run_pose_skeleton headless in both modes on the same source and prints
+capture fps, decision fps, dropped frames and capture -> decision latency.
+Needs a camera (or video file) and Body/pose_landmarker.task.
+"""
+import argparse
+import threading
+
+from Body.body import run_pose_skeleton
+
+
+def _source(value: str):
+    return int(value) if value.isdigit() else value
+
+
+def bench(source, seconds: float):
+    print(f"{'mode':14s} {'cap fps':>8s} {'dec fps':>8s} {'dropped':>8s} {'lat ms':>8s} {'max ms':>8s}")
+    for name, async_inference in [("VIDEO", False), ("LIVE_STREAM", True)]:
+        stop = threading.Event()
+        timer = threading.Timer(seconds, stop.set)
+        stats = {}
+        timer.start()
+        run_pose_skeleton(source, stop, headless=True, stats=stats, async_inference=async_inference)
+        timer.cancel()
+        print(
+            f"{name:14s} {stats['fps']:8.1f} {stats['decision_fps']:8.1f} {stats['dropped']:8d} "
+            f"{stats['latency_ms_mean']:8.1f} {stats['latency_ms_max']:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--source", default="0", help="camera index or video file")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    args = ap.parse_args()
+    bench(_source(args.source), args.seconds)
@@ -0,0 +1,66 @@
+"""
+check_hand_and_face: threaded workers vs worker processes (shared-memory ring).
+
+  python -m benchmarks.bench_presence_backend --face-dir FacialRecognition
+  python -m benchmarks.bench_presence_backend --source clip.mp4 --load 2
+
+--load N starts N busy Python threads in this process, standing in for
+the pose / speech threads that hold the GIL on the real box. Reported
+rates are frames actually evaluated per second by each worker; with the
+fps limits raised to 1000 they show the detector throughput each backend
+gets under that load.
+"""
+import argparse
+import threading
+import time
+
+from Perception.check_status import check_hand_and_face, get_presence_engine
+from Perception.process_workers import get_process_workers
+
+
+def _busy(stop):
+    x = 0
+    while not stop.is_set():
+        x = (x * 31 + 7) % 1000003
+
+
+def bench(source, face_dir: str, seconds: float, load: int, fps_limit: float):
+    # warm both backends so neither pays model loading / process spawn here
+    get_presence_engine(face_dir).warm()
+    get_process_workers(face_dir).start()
+    time.sleep(3.0)
+
+    stop = threading.Event()
+    burners = [threading.Thread(target=_busy, args=(stop,), daemon=True) for _ in range(load)]
+    for t in burners:
+        t.start()
+
+    print(f"load threads: {load}")
+    print(f"{'backend':10s} {'hand fps':>9s} {'face fps':>9s} {'status':>10s}")
+    try:
+        for backend in ("thread", "process"):
+            res = check_hand_and_face(
+                seconds=seconds,
+                camera_index=source,
+                face_dir=face_dir,
+                hand_fps_limit=fps_limit,
+                face_fps_limit=fps_limit,
+                backend=backend,
+            )
+            print(f"{backend:10s} {res.hand_frames / res.elapsed:9.1f} "
+                  f"{res.face_frames / res.elapsed:9.1f} {res.status:>10s}")
+    finally:
+        stop.set()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--source", default="0", help="camera index or video file")
+    ap.add_argument("--face-dir", default="FacialRecognition")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--load", type=int, default=2)
+    ap.add_argument("--fps-limit", type=float, default=1000.0)
+    args = ap.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    bench(source, args.face_dir, args.seconds, args.load, args.fps_limit)
@@ -0,0 +1,88 @@
+"""
+Setup cost of check_hand_and_face: per-call loading vs the resident engine.
+
+  python -m benchmarks.bench_presence_engine --face-dir FacialRecognition
+
+"cold" is what every call used to pay, rebuilt from scratch each time
+(nothing from the engine, the model pool or the cached asset buffers):
+cascade XML + trained_model.yml + id_to_name.pkl + a HandLandmarker from
+the .task file. Without a trained_model.yml the recognizer is a full read
+of trained_model.lbph instead, and the output says so. "first acquire" is
+the one-time engine load; "steady" is the per-call cost once warm (a
+stat() of the model files).
+"""
+import argparse
+import os
+import pickle
+import time
+
+import cv2
+import numpy as np
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+
+from FacialRecognition.gallery_index import GalleryIndex
+from FacialRecognition.model_store import LEGACY_MODEL_FILE, MODEL_FILE
+from models.registry import DEFAULT_OPTIONS, model_path
+from Perception.check_status import PresenceEngine
+
+
+def _ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return float(np.median(times))
+
+
+def _cold_setup(face_dir: str):
+    # the per-call loading check_hand_and_face did before PresenceEngine
+    cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+
+    yml = os.path.join(face_dir, LEGACY_MODEL_FILE)
+    artifact = os.path.join(face_dir, MODEL_FILE)
+    if os.path.exists(yml):
+        cv2.face.LBPHFaceRecognizer_create().read(yml)
+    elif os.path.exists(artifact):
+        GalleryIndex.load(artifact, mmap=False)
+
+    pkl = os.path.join(face_dir, "id_to_name.pkl")
+    if os.path.exists(pkl):
+        with open(pkl, "rb") as f:
+            pickle.load(f)
+
+    options = vision.HandLandmarkerOptions(
+        base_options=python.BaseOptions(model_asset_path=str(model_path("hand"))),
+        **DEFAULT_OPTIONS["hand"],
+    )
+    vision.HandLandmarker.create_from_options(options).close()
+
+
+def bench(face_dir: str, repeat: int = 5):
+    cold_ms = _ms(lambda: _cold_setup(face_dir), repeat)
+    if os.path.exists(os.path.join(face_dir, LEGACY_MODEL_FILE)):
+        cold_name = "cold (per call, before)"
+    else:
+        cold_name = "cold (.lbph full read)"
+
+    engine = PresenceEngine(face_dir)
+    t0 = time.perf_counter()
+    engine.acquire()
+    first_ms = (time.perf_counter() - t0) * 1000.0
+    steady_ms = _ms(engine.acquire, repeat * 100)
+    engine.close()
+
+    print(f"{cold_name:28s} {cold_ms:10.3f} ms")
+    print(f"{'engine first acquire':28s} {first_ms:10.3f} ms")
+    print(f"{'engine steady acquire':28s} {steady_ms:10.3f} ms")
+    for name, ms in engine.load_ms.items():
+        print(f"  load {name:22s} {ms:10.3f} ms")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--face-dir", default="FacialRecognition")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    bench(args.face_dir, args.repeat)
@@ -10,7 +10,7 @@ class AlertSender:
         self.last_alert_time = {}
         self.cooldown_seconds = 5  # Prevent spam
     
-    def send_alert(self, alert_type, location='Unknown', message='', ai_response=None, user_id=None):
+    def send_alert(self, alert_type, location='Unknown', message='', ai_response=None, user_id=None, keyframes=None):
         """
         Send alert to Node.js server
         
@@ -20,6 +20,7 @@ class AlertSender:
             message: Alert message
             ai_response: Optional AI-generated response
             user_id: Optional user ID
+            keyframes: Optional list of base64 JPEG frames from before the event
         """
         # Check cooldown
         now = time.time()
@@ -36,6 +37,8 @@ class AlertSender:
             'aiResponse': ai_response,
             'timestamp': datetime.utcnow().isoformat()
         }
+        if keyframes:
+            alert_data['keyframes'] = keyframes
         
         try:
             response = requests.post(
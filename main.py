@@ -24,22 +24,34 @@ def suppress_native_stderr(enabled: bool = True):
         os.dup2(old_fd, 2)
         os.close(old_fd)
 
-with suppress_native_stderr(True):
-    from Body.body import run_pose_skeleton
-    from Vocal_Input.speechToText import wait_for_wake_word, calibrate_mic
-    from Vocal_Output.labs import speak
-    from Hands.hand import hand_moved   
-    from Perception.check_status import check_hand_and_face
-    from moorcheh.get_alerts import generate_alert_message
-    from location.get_location import get_laptop_location_ip
-    from location.reverse_geocode import reverse_geocode
-    from data_transfer import send_custom_alert
+# spawned worker processes (presence_backend="process") re-import this file
+# as __mp_main__; they must not load the speech / TTS / location stack again
+if __name__ == "__main__":
+    with suppress_native_stderr(True):
+        from Body.pose_service import PoseService
+        from Vocal_Input.speechToText import wait_for_wake_word, calibrate_mic
+        from Vocal_Output.labs import speak
+        from Hands.hand import hand_moved   
+        from Perception.check_status import check_hand_and_face, get_presence_engine
+        from Perception.process_workers import get_process_workers
+        from moorcheh.get_alerts import generate_alert_message
+        from location.get_location import get_laptop_location_ip
+        from location.reverse_geocode import reverse_geocode
+        from data_transfer import send_custom_alert
+        from Camera.frame_bus import get_frame_bus
+        from Camera.clip_buffer import PreEventBuffer
+        from models import model_report
 
 import threading
 
 #Toggle API
 presentation = False
-calibrate_mic(duration=0.8)
+#Toggle pose preview window (True on appliances without a display)
+headless = False
+#Where trained_model.lbph and registry.db live
+face_dir = "FacialRecognition"
+#Presence-check backend: "thread" (hands from the pose stream) or "process" (hand/face models in worker processes)
+presence_backend = "thread"
 
 def present(s):
     if presentation:
@@ -48,6 +60,29 @@ def present(s):
         print(s)
 
 def main():
+    calibrate_mic(duration=0.8)
+
+    # one camera for pose, presence check and hands; stays open across cycles
+    frame_bus = get_frame_bus(0)
+
+    # pose model + FallDetector stay loaded; each cycle just resumes it
+    # last 5 s before a fall are kept (downscaled) and attached to alerts
+    pose_service = PoseService(
+        0,
+        frame_bus=frame_bus,
+        headless=headless,
+        clip_buffer=PreEventBuffer(seconds=5.0, fps=10.0, max_side=640),
+    ).start()
+
+    # presence-check detectors load now instead of right after a fall
+    if presence_backend == "process":
+        # worker processes spawn and load their models now, ring sized to the camera's frames
+        first = frame_bus.wait_newer(0, timeout=2.0)
+        get_process_workers(face_dir).start(first.image.shape if first else (480, 640, 3))
+    else:
+        get_presence_engine(face_dir).warm()
+    print(model_report())
+
     while True:
         stop_event = threading.Event()
         trigger = {"source": None}
@@ -57,21 +92,22 @@ def main():
             if hit and trigger["source"] is None:
                 trigger["source"] = "wake"
 
-        def fall_wrapper():
-            fell = run_pose_skeleton(0, stop_event)
-            if fell and trigger["source"] is None:
+        def on_fall():
+            if trigger["source"] is None:
                 trigger["source"] = "fall"
+            stop_event.set()
 
         wake_thread = threading.Thread(target=wake_wrapper, daemon=True)
-        fall_thread = threading.Thread(target=fall_wrapper, daemon=True)
 
+        pose_service.subscribe(on_fall)
+        pose_service.resume()
         wake_thread.start()
-        fall_thread.start()
 
         stop_event.wait()
 
+        pose_service.pause()
+        pose_service.unsubscribe(on_fall)
         wake_thread.join(timeout=1)
-        fall_thread.join(timeout=1)
 
         print("Stopped by:", trigger["source"])
         if trigger["source"] == "wake":
@@ -84,9 +120,16 @@ def main():
             res = check_hand_and_face(
                 seconds=3.0,
                 camera_index=0,
-                face_dir="Face",                  # <-- set to where trained_model.yml is
+                face_dir=face_dir,
                 require_recognized_face=False,    # True if you ONLY want known people
                 show_window=False,
+                frame_bus=frame_bus,
+                backend=presence_backend,
+                early_exit="any",                 # any response below counts; stop looking once seen
+                # hands from the running pose model (hand model only as fallback); thread backend only
+                hand_source="pose" if presence_backend == "thread" else "landmarker",
+                pose_service=pose_service,
+                motion_prefilter=True,            # hand model only on motion (or every 0.5 s)
             )
 
             print("presence:", res.status, "hand:", res.saw_hand, "face:", res.saw_face, "id:", res.face_id)
@@ -104,9 +147,19 @@ def main():
                     person = res.face_id if getattr(res, "face_id", None) else "unknown_face"
 
                 mes = generate_alert_message(person, loc)
+
+                # pre-fall footage; encoding started when the fall was detected
+                keyframes = None
+                if pose_service.last_clip is not None:
+                    try:
+                        keyframes = pose_service.last_clip.result(timeout=2.0).keyframes_b64()
+                    except Exception as e:
+                        print(f"pre-event clip unavailable: {e}")
+
                 send_custom_alert(
                     alert_type='fall',
-                    message=mes
+                    message=mes,
+                    keyframes=keyframes
                 )
                 print('Send')
 
@@ -0,0 +1,19 @@
+from .registry import (
+    ModelAsset,
+    get_model_asset,
+    create_landmarker,
+    acquire_landmarker,
+    release_landmarker,
+    close_pool,
+    model_report
+)
+
+__all__ = [
+    'ModelAsset',
+    'get_model_asset',
+    'create_landmarker',
+    'acquire_landmarker',
+    'release_landmarker',
+    'close_pool',
+    'model_report'
+]
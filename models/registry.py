@@ -0,0 +1,194 @@
+"""
+MediaPipe .task models loaded once per process.
+
+Each model file is read into memory on first use and every landmarker is
+built from that one buffer (BaseOptions.model_asset_buffer). Landmarkers in
+IMAGE / VIDEO mode are pooled by (model, running mode, options): close()
+with release_landmarker() instead of .close() and the next caller gets the
+already initialised graph back. LIVE_STREAM landmarkers carry a result
+callback, so they are created fresh (still from the shared buffer).
+
+    lm = acquire_landmarker("hand", vision.RunningMode.VIDEO, num_hands=1)
+    ...
+    release_landmarker(lm)
+
+    print(model_report())   # load / create times
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# first existing path wins (the hand model is shipped in two folders)
+MODEL_FILES = {
+    "pose": [ROOT / "Body" / "pose_landmarker.task"],
+    "hand": [ROOT / "Hands" / "hand_landmarker.task", ROOT / "Perception" / "hand_landmarker.task"],
+}
+
+_LANDMARKERS = {
+    "pose": (vision.PoseLandmarkerOptions, vision.PoseLandmarker),
+    "hand": (vision.HandLandmarkerOptions, vision.HandLandmarker),
+}
+
+# options every caller gets unless overridden (same options -> same pool entry)
+DEFAULT_OPTIONS = {
+    "pose": dict(
+        num_poses=1,
+        min_pose_detection_confidence=0.6,
+        min_pose_presence_confidence=0.6,
+        min_tracking_confidence=0.6,
+    ),
+    "hand": dict(
+        num_hands=1,
+        min_hand_detection_confidence=0.5,
+        min_hand_presence_confidence=0.5,
+        min_tracking_confidence=0.5,
+    ),
+}
+
+MAX_IDLE_PER_KEY = 2
+
+
+# ============================================================
+# Model assets
+# ============================================================
+@dataclass
+class ModelAsset:
+    name: str
+    path: Path
+    data: bytes
+    load_ms: float
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+@dataclass
+class _Stats:
+    created: int = 0
+    reused: int = 0
+    create_ms: list = field(default_factory=list)
+
+
+_lock = threading.Lock()
+_assets: dict = {}
+_pool: dict = {}    # key -> [idle landmarkers]
+_keys: dict = {}    # id(landmarker) -> key
+_stats: dict = {}   # (model, mode name) -> _Stats
+
+
+def model_path(name: str) -> Path:
+    for path in MODEL_FILES[name]:
+        if path.exists():
+            return path
+    raise FileNotFoundError(f"{name} model not found at: {', '.join(str(p) for p in MODEL_FILES[name])}")
+
+
+def get_model_asset(name: str) -> ModelAsset:
+    """Reads the model file once; later calls return the same buffer."""
+    with _lock:
+        asset = _assets.get(name)
+        if asset is None:
+            path = model_path(name)
+            t0 = time.perf_counter()
+            data = path.read_bytes()
+            asset = _assets[name] = ModelAsset(name, path, data, (time.perf_counter() - t0) * 1000.0)
+        return asset
+
+
+def base_options(name: str) -> python.BaseOptions:
+    return python.BaseOptions(model_asset_buffer=get_model_asset(name).data)
+
+
+# ============================================================
+# Landmarker pool
+# ============================================================
+def _mode_name(running_mode) -> str:
+    return getattr(running_mode, "name", str(running_mode))
+
+
+def create_landmarker(name: str, running_mode, result_callback=None, **options):
+    """New landmarker for model `name` ("pose" / "hand") from the shared buffer."""
+    options_cls, landmarker_cls = _LANDMARKERS[name]
+    opts = options_cls(
+        base_options=base_options(name),
+        running_mode=running_mode,
+        result_callback=result_callback,
+        **{**DEFAULT_OPTIONS[name], **options},
+    )
+    t0 = time.perf_counter()
+    landmarker = landmarker_cls.create_from_options(opts)
+    ms = (time.perf_counter() - t0) * 1000.0
+
+    with _lock:
+        stats = _stats.setdefault((name, _mode_name(running_mode)), _Stats())
+        stats.created += 1
+        stats.create_ms.append(ms)
+    return landmarker
+
+
+def acquire_landmarker(name: str, running_mode, **options):
+    """
+    Pooled IMAGE / VIDEO landmarker. VIDEO instances keep their last
+    timestamp, so callers must use a clock that keeps increasing across
+    uses (time.monotonic based).
+    """
+    if running_mode == vision.RunningMode.LIVE_STREAM:
+        raise ValueError("LIVE_STREAM landmarkers are not pooled; use create_landmarker()")
+
+    options = {**DEFAULT_OPTIONS[name], **options}
+    key = (name, _mode_name(running_mode), tuple(sorted(options.items())))
+    with _lock:
+        idle = _pool.get(key)
+        if idle:
+            landmarker = idle.pop()
+            _stats.setdefault(key[:2], _Stats()).reused += 1
+            _keys[id(landmarker)] = key
+            return landmarker
+
+    landmarker = create_landmarker(name, running_mode, **options)
+    with _lock:
+        _keys[id(landmarker)] = key
+    return landmarker
+
+
+def release_landmarker(landmarker):
+    """Returns a landmarker from acquire_landmarker() to the pool (closes it if the pool is full)."""
+    with _lock:
+        key = _keys.pop(id(landmarker), None)
+        if key is not None:
+            idle = _pool.setdefault(key, [])
+            if len(idle) < MAX_IDLE_PER_KEY:
+                idle.append(landmarker)
+                return
+    landmarker.close()
+
+
+def close_pool():
+    with _lock:
+        idle = [lm for lms in _pool.values() for lm in lms]
+        _pool.clear()
+    for landmarker in idle:
+        landmarker.close()
+
+
+# ============================================================
+# Report
+# ============================================================
+def model_report() -> str:
+    with _lock:
+        lines = [f"{'model':8s} {'file':34s} {'MB':>6s} {'read ms':>8s}"]
+        for asset in _assets.values():
+            lines.append(f"{asset.name:8s} {asset.path.name:34s} {asset.size / 1e6:6.2f} {asset.load_ms:8.2f}")
+        lines.append(f"{'model':8s} {'mode':12s} {'created':>8s} {'reused':>7s} {'first ms':>9s} {'mean ms':>8s}")
+        for (name, mode), s in _stats.items():
+            first = s.create_ms[0] if s.create_ms else 0.0
+            mean = sum(s.create_ms) / len(s.create_ms) if s.create_ms else 0.0
+            lines.append(f"{name:8s} {mode:12s} {s.created:8d} {s.reused:7d} {first:9.1f} {mean:8.1f}")
+    return "\n".join(lines)
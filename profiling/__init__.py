@@ -0,0 +1,15 @@
+from .stage_timer import (
+    StageTimer,
+    get_stage_timer,
+    stage_report,
+    dump_stage_timers,
+    install_dump_signal
+)
+
+__all__ = [
+    'StageTimer',
+    'get_stage_timer',
+    'stage_report',
+    'dump_stage_timers',
+    'install_dump_signal'
+]
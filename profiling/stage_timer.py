@@ -0,0 +1,158 @@
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# CAMM_PROFILE=0 turns every timer into a no-op
+ENABLED = os.environ.get("CAMM_PROFILE", "1") != "0"
+
+MAX_STAGES = 32
+
+# ============================================================
+# Stage timer (fixed-size histograms, no per-frame allocation)
+# ============================================================
+class StageTimer:
+    """
+    Per-stage latency histograms for one hot loop.
+
+    Usage inside a loop:
+        timer.start()
+        ret, frame = cap.read()
+        timer.lap("read")
+        ...
+        timer.lap("detect")
+
+    lap(stage) records the time since the previous start()/lap() on the
+    calling thread. Histograms use fixed log-spaced bins (10 us .. 10 s), so
+    recording is a bisect plus a few counter updates (~1.5 us per lap).
+    """
+
+    def __init__(self, name: str, min_seconds: float = 1e-5, max_seconds: float = 10.0, bins: int = 56):
+        self.name = name
+        self._edges = np.geomspace(min_seconds, max_seconds, bins - 1).tolist()
+        self._bins = bins
+
+        self._lock = threading.Lock()
+        self._index: dict[str, int] = {}
+        # plain preallocated lists: item updates are cheaper than NumPy scalar ops
+        self._counts = [[0] * bins for _ in range(MAX_STAGES)]
+        self._total = [0.0] * MAX_STAGES
+        self._max = [0.0] * MAX_STAGES
+        self._local = threading.local()
+
+    def _stage(self, stage: str) -> int:
+        i = self._index.get(stage)
+        if i is None:
+            with self._lock:
+                i = self._index.get(stage)
+                if i is None:
+                    if len(self._index) >= MAX_STAGES:
+                        raise ValueError(f"StageTimer '{self.name}': more than {MAX_STAGES} stages")
+                    i = len(self._index)
+                    self._index[stage] = i
+        return i
+
+    def start(self):
+        if ENABLED:
+            self._local.t = time.perf_counter()
+
+    def lap(self, stage: str):
+        if not ENABLED:
+            return
+        now = time.perf_counter()
+        prev = getattr(self._local, "t", None)
+        self._local.t = now
+        if prev is not None:
+            self.record(stage, now - prev)
+
+    def record(self, stage: str, seconds: float):
+        if not ENABLED:
+            return
+        i = self._stage(stage)
+        b = bisect.bisect_right(self._edges, seconds)
+        self._counts[i][b] += 1
+        self._total[i] += seconds
+        if seconds > self._max[i]:
+            self._max[i] = seconds
+
+    def reset(self):
+        with self._lock:
+            for counts in self._counts:
+                counts[:] = [0] * self._bins
+            self._total[:] = [0.0] * MAX_STAGES
+            self._max[:] = [0.0] * MAX_STAGES
+
+    def _percentile_ms(self, counts: np.ndarray, q: float) -> float:
+        n = counts.sum()
+        if n == 0:
+            return 0.0
+        b = int(np.searchsorted(np.cumsum(counts), q * n))
+        edge = self._edges[min(b, len(self._edges) - 1)]  # upper bound of that bin
+        return 1000.0 * edge
+
+    def summary(self) -> dict:
+        out = {}
+        for stage, i in list(self._index.items()):
+            counts = np.array(self._counts[i], dtype=np.int64)
+            n = int(counts.sum())
+            out[stage] = {
+                "count": n,
+                "mean_ms": 1000.0 * self._total[i] / n if n else 0.0,
+                "max_ms": 1000.0 * self._max[i],
+                "p50_ms": self._percentile_ms(counts, 0.50),
+                "p90_ms": self._percentile_ms(counts, 0.90),
+                "p99_ms": self._percentile_ms(counts, 0.99),
+                "histogram": counts.tolist(),
+            }
+        return out
+
+
+# ============================================================
+# Process-wide registry + JSON dump
+# ============================================================
+_timers: dict[str, StageTimer] = {}
+_timers_lock = threading.Lock()
+
+def get_stage_timer(name: str) -> StageTimer:
+    with _timers_lock:
+        timer = _timers.get(name)
+        if timer is None:
+            timer = StageTimer(name)
+            _timers[name] = timer
+        return timer
+
+def stage_report() -> dict:
+    with _timers_lock:
+        timers = list(_timers.values())
+    bin_edges_ms = [1000.0 * e for e in timers[0]._edges] if timers else []
+    return {
+        "enabled": ENABLED,
+        "bin_upper_edges_ms": bin_edges_ms,
+        "timers": {t.name: t.summary() for t in timers},
+    }
+
+def dump_stage_timers(path: str | None = None) -> str:
+    """Returns the report as JSON; also writes it to `path` if given."""
+    text = json.dumps(stage_report(), indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(text)
+    return text
+
+
+# CAMM_PROFILE_DUMP=/path/file.json -> report written on exit
+_dump_path = os.environ.get("CAMM_PROFILE_DUMP")
+if _dump_path and ENABLED:
+    atexit.register(dump_stage_timers, _dump_path)
+
+def install_dump_signal(path: str, signum=None):
+    """`kill -USR1 <pid>` writes the report to `path` (POSIX, main thread only)."""
+    import signal
+
+    if signum is None:
+        signum = signal.SIGUSR1
+    signal.signal(signum, lambda *_: dump_stage_timers(path))
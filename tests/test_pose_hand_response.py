@@ -0,0 +1,102 @@
+"""
+check_hand_and_face(hand_source="pose"): the person who fell is always in
+view of the pose stream, so only a moving hand may count as a response.
+"""
+import threading
+import time
+import types
+
+import numpy as np
+import pytest
+
+check_status = pytest.importorskip("Perception.check_status")
+
+
+def _pose(hand_x: float) -> np.ndarray:
+    lms = np.zeros((33, 4), np.float32)
+    lms[:, :2] = 0.5
+    lms[:, 3] = 0.9
+    lms[11, 0], lms[12, 0] = 0.4, 0.6            # shoulders, width 0.2
+    lms[15:23:2, 0] = hand_x                      # left hand points
+    lms[16:23:2, 0] = 0.7                         # right hand points, still
+    return lms
+
+
+class _StubPoseService:
+    """Feeds one pose every 20 ms to the listener while resumed."""
+
+    def __init__(self, hand_x):
+        self.hand_x = hand_x
+        self.paused = True
+        self._listener = None
+        self._stop = threading.Event()
+
+    def add_pose_listener(self, listener):
+        self._listener = listener
+
+    def remove_pose_listener(self, listener):
+        self._listener = None
+        self._stop.set()
+
+    def resume(self, detect_falls=True):
+        self.paused = False
+        self._stop.clear()
+
+        def feed():
+            i = 0
+            while not self._stop.wait(0.02):
+                listener = self._listener
+                if listener is not None:
+                    listener([_pose(self.hand_x(i))], time.monotonic())
+                i += 1
+
+        threading.Thread(target=feed, daemon=True).start()
+
+    def pause(self):
+        self.paused = True
+
+
+class _StubCapture:
+    def isOpened(self):
+        return True
+
+    def read(self):
+        time.sleep(0.02)
+        return True, np.zeros((120, 160, 3), np.uint8)
+
+    def release(self):
+        pass
+
+
+class _NoFaces:
+    def detectMultiScale(self, *args, **kwargs):
+        return ()
+
+
+def _check(hand_x):
+    hand = types.SimpleNamespace(hand_present=lambda frame: False)
+    engine = types.SimpleNamespace(
+        acquire=lambda: (_NoFaces(), None, {}, hand),
+        run_lock=threading.Lock(),
+    )
+    return check_status.check_hand_and_face(
+        seconds=0.6,
+        frame_bus=types.SimpleNamespace(subscribe=_StubCapture),
+        engine=engine,
+        early_exit="any",
+        hand_source="pose",
+        pose_service=_StubPoseService(hand_x),
+    )
+
+
+def test_visible_still_hand_is_no_response():
+    res = _check(lambda i: 0.3)
+    assert res.pose_frames > 0
+    assert not res.saw_hand and not res.hand_moved
+    assert res.status == "neither"
+
+
+def test_moving_hand_is_a_response():
+    res = _check(lambda i: 0.3 + 0.05 * (i % 4))
+    assert res.saw_hand and res.hand_moved
+    assert res.status == "hand_only"
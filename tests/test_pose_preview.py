@@ -0,0 +1,57 @@
+"""
+run_pose_skeleton with the preview window on and fall detection off (the
+post-fall check): the pose stream must keep running, no status text crash.
+"""
+import types
+
+import numpy as np
+import pytest
+
+body = pytest.importorskip("Body.body")
+
+
+class _Landmark:
+    def __init__(self, x, y):
+        self.x, self.y, self.z, self.visibility = x, y, 0.0, 0.9
+
+
+class _StubLandmarker:
+    def detect_for_video(self, image, timestamp_ms):
+        pose = [_Landmark(0.3 + 0.01 * i, 0.2 + 0.015 * i) for i in range(33)]
+        return types.SimpleNamespace(pose_landmarks=[pose])
+
+
+class _StubCapture:
+    def __init__(self, frames):
+        self.frames = frames
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.frames == 0:
+            return False, None
+        self.frames -= 1
+        return True, np.zeros((120, 160, 3), np.uint8)
+
+    def release(self):
+        pass
+
+
+def test_preview_with_fall_detection_off(monkeypatch):
+    monkeypatch.setattr(body.cv2, "imshow", lambda *a: None)
+    monkeypatch.setattr(body.cv2, "waitKey", lambda *a: -1)
+    monkeypatch.setattr(body.cv2, "destroyAllWindows", lambda: None, raising=False)
+
+    bus = types.SimpleNamespace(subscribe=lambda: _StubCapture(10))
+    seen = []
+    fell = body.run_pose_skeleton(
+        frame_bus=bus,
+        landmarker=_StubLandmarker(),
+        headless=False,
+        pose_listener=lambda poses, t: seen.append(len(poses)),
+        detect_falls=False,
+    )
+
+    assert fell is False
+    assert seen == [1] * 10